@@ -1,18 +1,30 @@
 from __future__ import annotations
 
+import io
 import os
+import queue
 import sys
 import time
 import platform
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from threading import Event, Thread
+from datetime import datetime, timezone
+from threading import Barrier, BrokenBarrierError, Event, Lock, Thread, local
 from typing import Optional
 
 import mss
 import pyautogui
-from PIL import Image, ImageDraw
+from PIL import Image, ImageDraw, features
 
-from logger import day_folder, utc_iso_millis, logger
+from logger import utc_iso_millis, logger
+
+# Optional Windows-only DXGI Desktop Duplication grabber. mss uses GDI BitBlt
+# on Windows, which is considerably slower for large displays.
+try:
+    import dxcam  # type: ignore[import-not-found]
+except Exception:
+    dxcam = None
 
 # On Windows, try to make the process DPI-aware so pyautogui returns
 # physical pixel coordinates that match mss captures. This is best-effort
@@ -37,37 +49,218 @@ if platform.system() == "Windows":
         pass
 
 
-def _get_monitor_index_for_point(monitors: list[dict], x: int, y: int) -> int:
-    # monitors[0] is the virtual screen; real monitors start at 1
-    for idx in range(1, len(monitors)):
-        mon = monitors[idx]
-        if mon["left"] <= x < mon["left"] + mon["width"] and mon["top"] <= y < mon["top"] + mon["height"]:
+def _resolve_cursor_pos():
+    """Pick the cheapest native cursor-position call for this platform.
+
+    pyautogui.position() wraps these same calls in several layers (and on
+    Windows repeats DPI handling already done above); it stays as the fallback.
+    """
+    system = platform.system()
+    try:
+        if system == "Windows":
+            import ctypes
+            from ctypes import wintypes
+
+            get_cursor_pos = ctypes.windll.user32.GetCursorPos
+            get_cursor_pos.argtypes = [ctypes.POINTER(wintypes.POINT)]
+            get_cursor_pos.restype = wintypes.BOOL
+
+            def _win_cursor_pos() -> tuple[int, int]:
+                pt = wintypes.POINT()
+                if not get_cursor_pos(ctypes.byref(pt)):
+                    raise OSError("GetCursorPos failed")
+                return pt.x, pt.y
+
+            return _win_cursor_pos
+        if system == "Darwin":
+            import Quartz  # type: ignore[import-not-found]
+
+            def _mac_cursor_pos() -> tuple[int, int]:
+                loc = Quartz.CGEventGetLocation(Quartz.CGEventCreate(None))
+                return int(loc.x), int(loc.y)
+
+            return _mac_cursor_pos
+        from Xlib import display as xdisplay  # type: ignore[import-not-found]
+
+        root = xdisplay.Display().screen().root
+        # python-xlib connections are not thread-safe
+        xlock = Lock()
+
+        def _x11_cursor_pos() -> tuple[int, int]:
+            with xlock:
+                reply = root.query_pointer()
+            return reply.root_x, reply.root_y
+
+        return _x11_cursor_pos
+    except Exception as e:
+        logger.debug(f"Native cursor position unavailable, using pyautogui: {e}")
+        return None
+
+
+_native_cursor_pos = _resolve_cursor_pos()
+
+
+def _get_cursor_pos() -> tuple[int, int]:
+    if _native_cursor_pos is not None:
+        try:
+            return _native_cursor_pos()
+        except Exception:
+            pass
+    x, y = pyautogui.position()
+    return x, y
+
+
+# JPEG encoding is only cheap when Pillow is linked against libjpeg-turbo
+# (true for the official wheels); note it in the log so slow encodes are explainable.
+try:
+    if not features.check_feature("libjpeg_turbo"):
+        logger.warning("Pillow is not built with libjpeg-turbo; JPEG screenshots will encode slowly.")
+except Exception:
+    pass
+
+
+def _monitor_bounds(monitors: list[dict]) -> list[tuple[int, int, int, int]]:
+    """Return (left, top, right, bottom) for each real monitor.
+
+    monitors[0] is the virtual screen, so entry i here is monitor i + 1.
+    """
+    return [
+        (mon["left"], mon["top"], mon["left"] + mon["width"], mon["top"] + mon["height"])
+        for mon in monitors[1:]
+    ]
+
+
+def _get_monitor_index_for_point(bounds: list[tuple[int, int, int, int]], x: int, y: int) -> int:
+    # Single display: nothing to test
+    if len(bounds) <= 1:
+        return 1
+    for idx, (left, top, right, bottom) in enumerate(bounds, 1):
+        if left <= x < right and top <= y < bottom:
             return idx
     # Fallback to primary monitor (1)
     return 1
 
 
-def _draw_cursor(
-    image: Image.Image,
-    cursor_pos: tuple[int, int],
-    monitor: dict,
+def _same_frame(a: object, b: object) -> bool:
+    if a is b:
+        return True
+    return isinstance(a, bytearray) and isinstance(b, bytearray) and a == b
+
+
+def _render_cursor_stamp(
     radius: int = 8,
     color: tuple[int, int, int] = (255, 0, 0),
     outline_width: int = 3,
-) -> None:
-    draw = ImageDraw.Draw(image)
+) -> Image.Image:
+    """Rasterize the cursor ring once into a transparent RGBA stamp of size 2r+1."""
+    size = 2 * radius + 1
+    stamp = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    ImageDraw.Draw(stamp).ellipse((0, 0, 2 * radius, 2 * radius), outline=color + (255,), width=outline_width)
+    return stamp
+
+
+def _draw_cursor(image: Image.Image, cursor_pos: tuple[int, int], monitor: dict, stamp: Image.Image) -> None:
     cx, cy = cursor_pos
-    # Transform to monitor-local coordinates
+    r = stamp.width // 2
+    # Transform to monitor-local coordinates; paste clips at the image edges
     mx = cx - monitor["left"]
     my = cy - monitor["top"]
-    r = radius
-    draw.ellipse((mx - r, my - r, mx + r, my + r), outline=color, width=outline_width)
+    image.paste(stamp, (mx - r, my - r), stamp)
+
+
+class _DxcamGrabber:
+    """Grab monitors through dxcam (DXGI Desktop Duplication).
+
+    Output ``i`` is assumed to be mss monitor ``i + 1``; an output is only used
+    when its size matches that monitor, otherwise it is disabled and callers
+    fall back to mss for it.
+    """
+
+    def __init__(self) -> None:
+        self._cameras: dict[int, object] = {}
+        self._last: dict[int, object] = {}
+        self._disabled: set[int] = set()
+        self._lock = Lock()
+
+    def grab(self, mon_idx: int, mon: dict):
+        """Return an H x W x 3 RGB ndarray for the monitor, or None to use mss."""
+        with self._lock:
+            if mon_idx in self._disabled:
+                return None
+            cam = self._cameras.get(mon_idx)
+            if cam is None:
+                try:
+                    cam = dxcam.create(output_idx=mon_idx - 1, output_color="RGB")
+                except Exception as e:
+                    logger.warning(f"dxcam unavailable for monitor {mon_idx}, using mss: {e}")
+                    cam = None
+                if cam is None or (cam.width, cam.height) != (mon["width"], mon["height"]):
+                    logger.info(f"dxcam output does not match monitor {mon_idx}; using mss for it")
+                    self._disabled.add(mon_idx)
+                    return None
+                self._cameras[mon_idx] = cam
+            frame = cam.grab()
+            if frame is None:
+                # Desktop Duplication only returns a frame when the screen changed;
+                # hand back the identical previous frame object in that case
+                return self._last.get(mon_idx)
+            self._last[mon_idx] = frame
+            return frame
+
+    def release(self) -> None:
+        with self._lock:
+            for cam in self._cameras.values():
+                try:
+                    cam.release()
+                except Exception:
+                    pass
+            self._cameras.clear()
+            self._last.clear()
+
+
+class _NvJpegEncoder:
+    """JPEG encoding on an NVIDIA GPU through the optional pynvjpeg package."""
+
+    def __init__(self) -> None:
+        # Imported lazily: pulls in CUDA and numpy, only wanted when configured
+        import numpy
+        from nvjpeg import NvJpeg  # type: ignore[import-not-found]
+
+        self._np = numpy
+        self._nj = NvJpeg()
+
+    def encode(self, img: Image.Image, quality: int) -> bytes:
+        # nvjpeg expects an OpenCV-style contiguous BGR array
+        bgr = self._np.ascontiguousarray(self._np.asarray(img)[:, :, ::-1])
+        return bytes(self._nj.encode(bgr, quality))
+
+
+# Queue marker telling the writer thread to exit.
+_WRITER_STOP = object()
+
+# File extension used for each supported screenshot format.
+_FORMAT_EXTENSIONS = {"jpeg": ".jpg", "png": ".png"}
 
 
 @dataclass
 class CaptureConfig:
     hz: float = 1.0
     output_base: str = "data"
+    # "jpeg" (default, libjpeg-turbo accelerated in Pillow wheels) or "png" (lossless)
+    output_format: str = "jpeg"
+    jpeg_quality: int = 85
+    # Don't encode/save a frame that is pixel-identical to the previous one for
+    # the same monitor (idle desktop); the previous file is reported instead.
+    # Opt-in: consumers that look for new files see none while the screen is idle.
+    skip_unchanged: bool = False
+    # "auto" uses dxcam on Windows when it is installed, "mss" always uses mss
+    grab_backend: str = "auto"
+    # JPEG encoder: "pillow" (CPU, libjpeg-turbo) or "nvjpeg" (NVIDIA GPU,
+    # needs pynvjpeg; falls back to Pillow if it cannot be initialised)
+    encoder: str = "pillow"
+    # Capture every monitor each tick (grabbed in parallel, one file per
+    # monitor) instead of only the monitor under the cursor
+    capture_all: bool = False
 
 
 class ScreenCapture:
@@ -76,18 +269,140 @@ class ScreenCapture:
         os.makedirs(self.config.output_base, exist_ok=True)
         self._thread: Optional[Thread] = None
         self._stop_event = Event()
+        # mss enumerates monitors once per instance and caches the list, so the
+        # capture loop reuses that list and only re-enumerates periodically or
+        # when refresh_monitors() is called (e.g. after a display change).
+        self._refresh_monitors_event = Event()
+        self._monitor_refresh_interval = 60.0
+        # Encoding and disk writes happen on a dedicated writer thread so the
+        # grab cadence does not depend on encode/IO latency. The queue is small
+        # and drops the oldest frame when full to stay real-time.
+        self._queue: queue.Queue = queue.Queue(maxsize=8)
+        self._writer_thread: Optional[Thread] = None
+        # Set while a stop marker is queued for a writer that hasn't exited yet
+        self._writer_stop_queued = False
+        # The writer encodes frames in memory and writes them out as soon as
+        # the queue is empty; only a backlog is coalesced, into batches of up
+        # to this many frames or whatever arrived within _flush_interval
+        # seconds of the first one.
+        self._flush_batch_size = 4
+        self._flush_interval = 0.25
         # cursor overlay settings (adjustable)
         self._cursor_radius = 8
         self._cursor_color = (255, 0, 0)
         self._cursor_outline_width = 3
+        # Pre-rendered cursor ring, rebuilt only when the settings above change
+        self._cursor_stamp: Optional[Image.Image] = None
+        self._cursor_stamp_key: Optional[tuple] = None
+        # PNG is lossless at every zlib level; level 1 is far cheaper to encode
+        # than Pillow's default (6) for full-screen captures.
+        self._png_compress_level = 1
+        # Precomputed monitor rectangles, rebuilt when mss hands out a new monitor list
+        self._mon_bounds_src: Optional[list[dict]] = None
+        self._mon_bounds: list[tuple[int, int, int, int]] = []
+        # Last grabbed frame per monitor index: (frame buffer, cursor pos,
+        # path it was queued under, UTC day). Owned by the capture thread.
+        self._last_frames: dict[int, tuple[object, tuple[int, int], str, str]] = {}
+        # Last screenshot the writer actually saved per monitor index. An
+        # unchanged frame is only reported if it reuses this very file.
+        self._written_paths: dict[int, str] = {}
+        self._dxcam: Optional[_DxcamGrabber] = None
+        # capture_all: pool of grab workers, each with its own mss handle
+        # (an mss instance must not be shared between threads)
+        self._grab_pool: Optional[ThreadPoolExecutor] = None
+        self._grab_pool_size = 0
+        self._grab_local = local()
+        self._worker_scts: list = []
+        self._worker_scts_lock = Lock()
+        # ((output_base, day), day folder, screenshots folder); the folders are
+        # only created when the UTC day or the output base changes.
+        self._day_cache: Optional[tuple[tuple[str, str], str, str]] = None
+        self._nvjpeg: Optional[_NvJpegEncoder] = None
+        self._nvjpeg_failed = False
         # Optional callback: called after a screenshot is saved.
         # Signature: on_capture(path: str, cursor_x: int, cursor_y: int, monitor_index: int)
         self.on_capture = None
 
+    def _file_extension(self) -> str:
+        return _FORMAT_EXTENSIONS.get(self.config.output_format.lower(), ".png")
+
+    def _encode_nvjpeg(self, img: Image.Image) -> Optional[bytes]:
+        if self._nvjpeg_failed:
+            return None
+        try:
+            if self._nvjpeg is None:
+                self._nvjpeg = _NvJpegEncoder()
+                logger.info("Encoding JPEG screenshots on the GPU (nvjpeg)")
+            return self._nvjpeg.encode(img, self.config.jpeg_quality)
+        except Exception as e:
+            # Disable for the rest of the session instead of failing every frame
+            logger.warning(f"nvjpeg encoder unavailable, using Pillow: {e}")
+            self._nvjpeg_failed = True
+            self._nvjpeg = None
+            return None
+
+    def _encode_image(self, img: Image.Image) -> bytes:
+        buf = io.BytesIO()
+        if self.config.output_format.lower() == "jpeg":
+            if self.config.encoder.lower() == "nvjpeg":
+                data = self._encode_nvjpeg(img)
+                if data is not None:
+                    return data
+            # Baseline (non-progressive) JPEG keeps libjpeg-turbo on its SIMD path
+            img.save(
+                buf,
+                format="JPEG",
+                quality=self.config.jpeg_quality,
+                subsampling=2,
+                optimize=False,
+                progressive=False,
+            )
+        else:
+            img.save(buf, format="PNG", compress_level=self._png_compress_level)
+        return buf.getvalue()
+
+    @staticmethod
+    def _write_file(path: str, data: bytes) -> None:
+        # One write of the fully encoded file instead of Pillow's chunk-by-chunk
+        # writes, into a temp name that is atomically renamed so readers (and
+        # on_capture consumers) never see a partially written screenshot.
+        tmp = path + ".tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            try:
+                view = memoryview(data)
+                while view:
+                    written = os.write(fd, view)
+                    view = view[written:]
+            finally:
+                os.close(fd)
+            os.replace(tmp, path)
+        except Exception:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+    def _save_image(self, img: Image.Image, path: str) -> None:
+        self._write_file(path, self._encode_image(img))
+
     def start(self) -> None:
         if self._thread and self._thread.is_alive():
             return
+        writer = self._writer_thread
+        if writer is not None and writer.is_alive() and self._writer_stop_queued:
+            # An earlier stop() timed out; that writer exits once it reaches
+            # its stop marker, so give it the chance before starting another
+            writer.join(timeout=2.0)
+            if writer.is_alive():
+                logger.error("Previous screenshot writer is still draining; not starting capture")
+                return
         self._stop_event.clear()
+        if not (self._writer_thread and self._writer_thread.is_alive()):
+            self._writer_stop_queued = False
+            self._writer_thread = Thread(target=self._writer_loop, daemon=True)
+            self._writer_thread.start()
         self._thread = Thread(target=self._run_loop, daemon=True)
         self._thread.start()
 
@@ -95,114 +410,382 @@ class ScreenCapture:
         self._stop_event.set()
         if self._thread:
             self._thread.join(timeout=2.0)
+        if self._writer_thread:
+            # The marker is queued behind any pending frames so they still get
+            # written; only one, or the next writer would consume a leftover
+            if not self._writer_stop_queued:
+                try:
+                    self._queue.put(_WRITER_STOP, timeout=2.0)
+                    self._writer_stop_queued = True
+                except queue.Full:
+                    logger.warning("Screenshot writer did not drain before stop")
+            self._writer_thread.join(timeout=2.0)
+            # Keep the handle of a writer that is still busy so start() reuses
+            # or waits for it instead of running a second one on the same queue
+            if self._writer_thread.is_alive():
+                logger.warning("Screenshot writer is still running after stop")
+            else:
+                self._writer_thread = None
+                self._writer_stop_queued = False
+
+    def refresh_monitors(self) -> None:
+        """Make the capture loop re-enumerate monitors before its next grab."""
+        self._refresh_monitors_event.set()
 
     def is_running(self) -> bool:
         return self._thread is not None and self._thread.is_alive()
 
     def _run_loop(self) -> None:
         interval = max(0.05, 1.0 / max(0.1, self.config.hz))
-        with mss.mss() as sct:
+        if (
+            dxcam is not None
+            and platform.system() == "Windows"
+            and self.config.grab_backend.lower() == "auto"
+        ):
+            self._dxcam = _DxcamGrabber()
+            logger.info("Using dxcam (DXGI Desktop Duplication) for screen grabs")
+        else:
+            self._dxcam = None
+        sct = mss.mss()
+        monitors = sct.monitors
+        monitors_at = time.monotonic()
+        try:
+            # Schedule against the monotonic clock so time spent grabbing and
+            # encoding doesn't stretch the period and make the capture rate drift.
+            next_tick = time.monotonic()
             while not self._stop_event.is_set():
                 try:
-                    cursor_x, cursor_y = pyautogui.position()
-                    monitors = sct.monitors
-                    mon_idx = _get_monitor_index_for_point(monitors, cursor_x, cursor_y)
-                    mon = monitors[mon_idx]
-                    # Attempt the grab with a retry for transient failures
-                    raw = None
-                    for attempt in range(2):
-                        try:
-                            raw = sct.grab(mon)
-                            break
-                        except Exception as e:
-                            logger.warning(f"mss.grab failed (attempt {attempt+1}): {e}")
-                            time.sleep(0.02)
-                    if raw is None:
-                        raise RuntimeError("mss.grab failed after retries")
-                    img = Image.frombytes("RGB", raw.size, raw.rgb)
-                    _draw_cursor(
-                        img,
-                        (cursor_x, cursor_y),
-                        mon,
-                        radius=self._cursor_radius,
-                        color=self._cursor_color,
-                        outline_width=self._cursor_outline_width,
-                    )
-
-                    folder = day_folder(self.config.output_base)
-                    # Save 1Hz screenshots to screenshots subfolder
-                    screenshots_folder = os.path.join(folder, "screenshots")
-                    os.makedirs(screenshots_folder, exist_ok=True)
-                    filename = utc_iso_millis() + ".png"
-                    path = os.path.join(screenshots_folder, filename)
-                    # Attempt to save with a small retry in case of transient IO errors
-                    saved = False
-                    last_exc = None
-                    for attempt in range(2):
-                        try:
-                            img.save(path)
-                            saved = True
-                            logger.info(f"Saved screenshot: {path}")
-                            # Notify callback if present (don't block or raise)
-                            try:
-                                cb = getattr(self, "on_capture", None)
-                                if callable(cb):
-                                    try:
-                                        cb(path, cursor_x, cursor_y, mon_idx)
-                                    except Exception:
-                                        logger.exception("on_capture callback raised")
-                            except Exception:
-                                pass
-                            break
-                        except Exception as e:
-                            last_exc = e
-                            logger.warning(f"Failed to save screenshot (attempt {attempt+1}): {e}")
-                            time.sleep(0.05)
-                    if not saved:
-                        logger.error(f"Could not save screenshot after retries: {path} -- {last_exc}")
+                    if (
+                        self._refresh_monitors_event.is_set()
+                        or next_tick - monitors_at >= self._monitor_refresh_interval
+                    ):
+                        self._refresh_monitors_event.clear()
+                        sct.close()
+                        sct = mss.mss()
+                        monitors = sct.monitors
+                        monitors_at = next_tick
+                    if self.config.capture_all:
+                        self._ensure_grab_pool(len(monitors) - 1)
+                    self._capture_tick(sct, monitors)
                 except Exception as e:
                     # Best-effort capture loop; avoid crashing but log the error so we can diagnose
                     try:
                         logger.exception(f"Error during screen capture: {e}")
                     except Exception:
                         # Last-resort: print the traceback
-                        import traceback
-
                         traceback.print_exc()
-                time.sleep(interval)
+                next_tick += interval
+                delay = next_tick - time.monotonic()
+                if delay < -interval:
+                    # Overran by more than a full period; resync instead of bursting to catch up
+                    next_tick = time.monotonic()
+                elif delay > 0 and self._stop_event.wait(delay):
+                    # stop() was called while waiting; exit without another tick
+                    break
+        finally:
+            sct.close()
+            self._shutdown_grab_pool()
+        if self._dxcam is not None:
+            self._dxcam.release()
+            self._dxcam = None
+
+    def _get_cursor_stamp(self) -> Image.Image:
+        key = (self._cursor_radius, self._cursor_color, self._cursor_outline_width)
+        if self._cursor_stamp is None or key != self._cursor_stamp_key:
+            self._cursor_stamp = _render_cursor_stamp(*key)
+            self._cursor_stamp_key = key
+        return self._cursor_stamp
+
+    def _output_folders(self, now: datetime) -> tuple[str, str]:
+        """Return (day folder, screenshots folder) for the UTC day of ``now``."""
+        key = (self.config.output_base, now.strftime("%Y-%m-%d"))
+        cached = self._day_cache
+        if cached is not None and cached[0] == key:
+            return cached[1], cached[2]
+        folder = os.path.join(key[0], key[1])
+        screenshots_folder = os.path.join(folder, "screenshots")
+        os.makedirs(screenshots_folder, exist_ok=True)
+        self._day_cache = (key, folder, screenshots_folder)
+        return folder, screenshots_folder
+
+    def _monitor_index_for_point(self, monitors: list[dict], x: int, y: int) -> int:
+        if monitors is not self._mon_bounds_src:
+            self._mon_bounds = _monitor_bounds(monitors)
+            self._mon_bounds_src = monitors
+        return _get_monitor_index_for_point(self._mon_bounds, x, y)
+
+    def _ensure_grab_pool(self, n_monitors: int) -> None:
+        workers = max(1, n_monitors)
+        if self._grab_pool is not None and self._grab_pool_size == workers:
+            return
+        self._shutdown_grab_pool()
+        self._grab_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="capture-grab")
+        self._grab_pool_size = workers
+
+    def _shutdown_grab_pool(self) -> None:
+        if self._grab_pool is not None:
+            # mss keeps its Windows DCs per thread, so each worker closes its
+            # own handle. The barrier holds every task until all have started,
+            # which puts exactly one on each worker thread.
+            barrier = Barrier(self._grab_pool_size)
+            for _ in range(self._grab_pool_size):
+                self._grab_pool.submit(self._close_worker_sct, barrier)
+            self._grab_pool.shutdown(wait=True)
+            self._grab_pool = None
+        with self._worker_scts_lock:
+            # Only left over if a worker never got to run its close task
+            for worker_sct in self._worker_scts:
+                try:
+                    worker_sct.close()
+                except Exception as e:
+                    logger.warning(f"Could not close grab worker's mss handle: {e}")
+            self._worker_scts.clear()
+        self._grab_local = local()
+
+    def _close_worker_sct(self, barrier: Barrier) -> None:
+        try:
+            barrier.wait(timeout=2.0)
+        except BrokenBarrierError:
+            pass
+        worker_sct = getattr(self._grab_local, "sct", None)
+        if worker_sct is None:
+            return
+        self._grab_local.sct = None
+        with self._worker_scts_lock:
+            self._worker_scts.remove(worker_sct)
+        try:
+            worker_sct.close()
+        except Exception as e:
+            logger.warning(f"Could not close grab worker's mss handle: {e}")
+
+    def _grab_frame_in_worker(self, mon_idx: int, mon: dict) -> tuple[tuple[int, int], object, str]:
+        worker_sct = getattr(self._grab_local, "sct", None)
+        if worker_sct is None:
+            worker_sct = mss.mss()
+            self._grab_local.sct = worker_sct
+            with self._worker_scts_lock:
+                self._worker_scts.append(worker_sct)
+        return self._grab_frame(worker_sct, mon_idx, mon)
+
+    def _capture_tick(self, sct, monitors: list[dict]) -> None:
+        cursor_x, cursor_y = _get_cursor_pos()
+        mon_idx = self._monitor_index_for_point(monitors, cursor_x, cursor_y)
+        now = datetime.now(timezone.utc)
+        if self.config.capture_all and self._grab_pool is not None and len(monitors) > 2:
+            # mss releases the GIL inside the native grab, so monitors grab concurrently
+            futures = {
+                idx: self._grab_pool.submit(self._grab_frame_in_worker, idx, monitors[idx])
+                for idx in range(1, len(monitors))
+            }
+            for idx, future in futures.items():
+                try:
+                    grabbed = future.result()
+                except Exception as e:
+                    logger.warning(f"Grab of monitor {idx} failed: {e}")
+                    continue
+                self._emit_frame(idx, monitors[idx], grabbed, (cursor_x, cursor_y), idx == mon_idx, now, f"_mon{idx}")
+        else:
+            grabbed = self._grab_frame(sct, mon_idx, monitors[mon_idx])
+            self._emit_frame(mon_idx, monitors[mon_idx], grabbed, (cursor_x, cursor_y), True, now, "")
+
+    def _emit_frame(
+        self,
+        mon_idx: int,
+        mon: dict,
+        grabbed: tuple[tuple[int, int], object, str],
+        cursor_pos: tuple[int, int],
+        has_cursor: bool,
+        now: datetime,
+        suffix: str,
+    ) -> None:
+        """Queue one grabbed monitor frame for the writer.
+
+        Only the frame under the cursor gets the cursor overlay and is reported
+        through on_capture.
+        """
+        size, frame, rawmode = grabbed
+        cursor_x, cursor_y = cursor_pos
+        if self.config.skip_unchanged:
+            # mss: exact comparison (memcmp) against the previous grab of this
+            # monitor; it bails at the first differing byte, so it is much cheaper
+            # than encoding and never misses small changes. dxcam hands back the
+            # very same frame object when nothing changed.
+            # A new UTC day always gets its own file in that day's folder.
+            last = self._last_frames.get(mon_idx)
+            day = now.strftime("%Y-%m-%d")
+            if (
+                last is not None
+                and last[3] == day
+                and last[1] == cursor_pos
+                and _same_frame(last[0], frame)
+            ):
+                logger.debug(f"Screen unchanged; reusing {last[2]}")
+                self._enqueue((None, last[2], cursor_x, cursor_y, mon_idx, has_cursor))
+                return
+        img = Image.frombuffer("RGB", size, frame, "raw", rawmode, 0, 1)
+        if has_cursor:
+            _draw_cursor(img, cursor_pos, mon, self._get_cursor_stamp())
+
+        # Save 1Hz screenshots to screenshots subfolder
+        _, screenshots_folder = self._output_folders(now)
+        filename = utc_iso_millis(now) + suffix + self._file_extension()
+        path = os.path.join(screenshots_folder, filename)
+        # Recorded before queueing so a drop or write failure can forget it
+        if self.config.skip_unchanged:
+            self._last_frames[mon_idx] = (frame, cursor_pos, path, day)
+        self._enqueue((img, path, cursor_x, cursor_y, mon_idx, has_cursor))
+
+    def _grab_frame(self, sct, mon_idx: int, mon: dict) -> tuple[tuple[int, int], object, str]:
+        """Grab a monitor and return (size, pixel buffer, Pillow raw mode)."""
+        if self._dxcam is not None:
+            try:
+                arr = self._dxcam.grab(mon_idx, mon)
+                if arr is not None:
+                    return (arr.shape[1], arr.shape[0]), arr, "RGB"
+            except Exception as e:
+                logger.warning(f"dxcam grab failed, falling back to mss: {e}")
+        # Attempt the grab with a retry for transient failures
+        raw = None
+        for attempt in range(2):
+            try:
+                raw = sct.grab(mon)
+                break
+            except Exception as e:
+                logger.warning(f"mss.grab failed (attempt {attempt+1}): {e}")
+                # Back off briefly, but don't hold up stop()
+                self._stop_event.wait(0.02)
+        if raw is None:
+            raise RuntimeError("mss.grab failed after retries")
+        # Decode the native BGRX buffer directly; raw.rgb would build an
+        # intermediate full-frame RGB copy before Pillow copies it again.
+        return raw.size, raw.raw, "BGRX"
+
+    def _enqueue(self, item: tuple) -> None:
+        """Queue a frame for the writer thread, dropping the oldest frame if full."""
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    dropped = self._queue.get_nowait()
+                except queue.Empty:
+                    continue
+                if dropped is _WRITER_STOP:
+                    # Writer is shutting down; keep the marker and discard this frame
+                    self._queue.put_nowait(dropped)
+                    return
+                logger.warning(f"Screenshot writer is behind; dropped frame {dropped[1]}")
+                if dropped[0] is not None:
+                    self._forget_frame(dropped[4], dropped[1])
+
+    def _forget_frame(self, mon_idx: int, path: str) -> None:
+        """Stop reusing ``path`` for unchanged frames; it never reached disk.
+
+        Called from the capture thread (dropped frame) and the writer (failed
+        encode or write). If the capture thread has already moved on to a
+        newer frame this is a no-op, at worst one frame is re-encoded.
+        """
+        last = self._last_frames.get(mon_idx)
+        if last is not None and last[2] == path:
+            self._last_frames.pop(mon_idx, None)
+
+    def _writer_loop(self) -> None:
+        batch: list[tuple] = []
+        deadline = 0.0
+        stopping = False
+        while not stopping:
+            timeout = max(0.0, deadline - time.monotonic()) if batch else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is _WRITER_STOP:
+                stopping = True
+            elif item is not None:
+                img, path, cursor_x, cursor_y, mon_idx, notify = item
+                try:
+                    # img is None for an unchanged frame that reuses an existing file
+                    data = self._encode_image(img) if img is not None else None
+                except Exception as e:
+                    logger.error(f"Failed to encode screenshot {path}: {e}")
+                    self._forget_frame(mon_idx, path)
+                else:
+                    if not batch:
+                        deadline = time.monotonic() + self._flush_interval
+                    batch.append((data, path, cursor_x, cursor_y, mon_idx, notify))
+            # Nothing else waiting means no burst to coalesce: write now so a
+            # lone frame (the normal case at 1 Hz) isn't held for the interval
+            if batch and (
+                stopping
+                or item is None
+                or len(batch) >= self._flush_batch_size
+                or self._queue.empty()
+            ):
+                self._flush(batch)
+                batch = []
+
+    def _flush(self, batch: list[tuple]) -> None:
+        for data, path, cursor_x, cursor_y, mon_idx, notify in batch:
+            if data is None:
+                # Frames are flushed in order, so the file this reuses has
+                # been written by now, or it was dropped or failed.
+                if self._written_paths.get(mon_idx) != path:
+                    logger.debug(f"Unchanged frame refers to unsaved {path}; not reporting it")
+                    self._forget_frame(mon_idx, path)
+                    continue
+                # Bump the mtime so "newest screenshot" lookups still find it
+                try:
+                    os.utime(path)
+                except OSError as e:
+                    logger.warning(f"Reused screenshot is gone: {path} -- {e}")
+                    self._written_paths.pop(mon_idx, None)
+                    self._forget_frame(mon_idx, path)
+                    continue
+                if notify:
+                    self._notify(path, cursor_x, cursor_y, mon_idx)
+                continue
+            # No retry: a transient failure only loses this frame and the next
+            # tick produces a fresh one, so don't stall the writer sleeping.
+            try:
+                self._write_file(path, data)
+            except Exception as e:
+                logger.error(f"Could not save screenshot: {path} -- {e}")
+                self._forget_frame(mon_idx, path)
+                continue
+            self._written_paths[mon_idx] = path
+            logger.info(f"Saved screenshot: {path}")
+            if notify:
+                self._notify(path, cursor_x, cursor_y, mon_idx)
+
+    def _notify(self, path: str, cursor_x: int, cursor_y: int, mon_idx: int) -> None:
+        # Notify callback if present (don't block or raise)
+        try:
+            cb = getattr(self, "on_capture", None)
+            if callable(cb):
+                try:
+                    cb(path, cursor_x, cursor_y, mon_idx)
+                except Exception:
+                    logger.exception("on_capture callback raised")
+        except Exception:
+            pass
 
     def capture_once(self) -> Optional[str]:
         """Capture a single screenshot immediately and return the path or None on failure."""
         try:
             with mss.mss() as sct:
-                cursor_x, cursor_y = pyautogui.position()
+                cursor_x, cursor_y = _get_cursor_pos()
                 monitors = sct.monitors
-                mon_idx = _get_monitor_index_for_point(monitors, cursor_x, cursor_y)
+                mon_idx = self._monitor_index_for_point(monitors, cursor_x, cursor_y)
                 mon = monitors[mon_idx]
-                # attempt grab with a retry
-                raw = None
-                for attempt in range(2):
-                    try:
-                        raw = sct.grab(mon)
-                        break
-                    except Exception as e:
-                        logger.warning(f"capture_once: mss.grab failed (attempt {attempt+1}): {e}")
-                        time.sleep(0.02)
-                if raw is None:
-                    raise RuntimeError("capture_once: mss.grab failed after retries")
-                img = Image.frombytes("RGB", raw.size, raw.rgb)
-                _draw_cursor(
-                    img,
-                    (cursor_x, cursor_y),
-                    mon,
-                    radius=self._cursor_radius,
-                    color=self._cursor_color,
-                    outline_width=self._cursor_outline_width,
-                )
-                folder = day_folder(self.config.output_base)
-                filename = utc_iso_millis() + ".png"
+                size, frame, rawmode = self._grab_frame(sct, mon_idx, mon)
+                img = Image.frombuffer("RGB", size, frame, "raw", rawmode, 0, 1)
+                _draw_cursor(img, (cursor_x, cursor_y), mon, self._get_cursor_stamp())
+                now = datetime.now(timezone.utc)
+                folder, _ = self._output_folders(now)
+                filename = utc_iso_millis(now) + self._file_extension()
                 path = os.path.join(folder, filename)
-                img.save(path)
+                self._save_image(img, path)
                 logger.info(f"capture_once: saved {path}")
                 try:
                     cb = getattr(self, "on_capture", None)
@@ -1,17 +1,23 @@
 from __future__ import annotations
 
 import logging
+from collections import OrderedDict
 from dataclasses import dataclass
 import os
+import platform
+import queue
+import re
+import time
 from datetime import datetime, timezone
-from threading import Thread
+from threading import Event, Lock, Thread
 from typing import Callable, Optional
 
 import psutil
 from pynput import mouse
-import pyautogui
-import pygetwindow
-import mss
+from pynput.mouse import Button
+# pyautogui, pygetwindow and mss (via monitors) are imported where they are
+# used: each is only needed on a fallback or browser-only path and pyautogui
+# is slow to load.
 
 logger = logging.getLogger(__name__)
 
@@ -24,153 +30,378 @@ pynput_mouse_logger = logging.getLogger('pynput.mouse.Listener')
 pynput_mouse_logger.setLevel(logging.CRITICAL)
 
 
-def _get_active_window_title() -> Optional[str]:
+# Win32 modules are imported once here and the functions used per click bound
+# to module globals, so the hot path does no import or attribute lookups.
+# user32 is called directly for the foreground HWND and its title; pygetwindow
+# wraps the same calls in Python window objects on every query.
+if os.name == 'nt':
+    import ctypes
+    from ctypes import wintypes
+
+    import win32api
+    import win32clipboard
+    import win32con
+    import win32gui
+    import win32process
+
+    _GetWindowThreadProcessId = win32process.GetWindowThreadProcessId
+    _GetWindowText = win32gui.GetWindowText
+    _EnumWindows = win32gui.EnumWindows
+    _EnumDisplayMonitors = win32api.EnumDisplayMonitors
+
+    _GetForegroundWindow = ctypes.windll.user32.GetForegroundWindow
+    _GetForegroundWindow.restype = wintypes.HWND
+    _GetWindowTextW = ctypes.windll.user32.GetWindowTextW
+    _GetWindowTextW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+    _GetWindowTextW.restype = ctypes.c_int
+    _TITLE_BUF = ctypes.create_unicode_buffer(512)
+    _TITLE_BUF_LOCK = Lock()
+else:
+    win32clipboard = None
+
+
+# Two clicks closer together than the system double-click time and rectangle
+# belong to the same gesture; both values are read once at import.
+_DOUBLE_CLICK_NS = 500 * 1_000_000
+_DOUBLE_CLICK_PX = 4
+if os.name == 'nt':
     try:
-        win = pygetwindow.getActiveWindow()
-        if win:
-            return win.title
+        _DOUBLE_CLICK_NS = ctypes.windll.user32.GetDoubleClickTime() * 1_000_000
+        # SM_CXDOUBLECLK is the full width of the rectangle centred on the first click
+        _DOUBLE_CLICK_PX = max(1, win32api.GetSystemMetrics(win32con.SM_CXDOUBLECLK) // 2)
     except Exception:
         pass
-    return None
 
 
-def _get_active_process_info() -> tuple[Optional[str], Optional[int]]:
+def _resolve_posix_foreground():
+    """Pick a native (handle, pid, title) query for the foreground window.
+
+    Off Windows the window system reports the owning PID itself, which saves
+    scanning every process for a browser. Returns None if unavailable.
+    """
+    if os.name == 'nt':
+        return None
     try:
-        # First try to get active window info
-        active_win = None
+        if platform.system() == "Darwin":
+            import Quartz  # type: ignore[import-not-found]
+
+            options = Quartz.kCGWindowListOptionOnScreenOnly | Quartz.kCGWindowListExcludeDesktopElements
+
+            def _mac_foreground() -> tuple[Optional[int], Optional[int], Optional[str]]:
+                # Front-to-back order; the first normal-layer window is frontmost
+                for info in Quartz.CGWindowListCopyWindowInfo(options, Quartz.kCGNullWindowID) or ():
+                    if info.get(Quartz.kCGWindowLayer) == 0:
+                        return (
+                            info.get(Quartz.kCGWindowNumber),
+                            info.get(Quartz.kCGWindowOwnerPID),
+                            info.get(Quartz.kCGWindowName) or info.get(Quartz.kCGWindowOwnerName),
+                        )
+                return None, None, None
+
+            return _mac_foreground
+        from Xlib import X, display as xdisplay  # type: ignore[import-not-found]
+
+        disp = xdisplay.Display()
+        root = disp.screen().root
+        net_active = disp.intern_atom("_NET_ACTIVE_WINDOW")
+        net_pid = disp.intern_atom("_NET_WM_PID")
+        net_name = disp.intern_atom("_NET_WM_NAME")
+        # python-xlib connections are not thread-safe
+        xlock = Lock()
+
+        def _x11_foreground() -> tuple[Optional[int], Optional[int], Optional[str]]:
+            with xlock:
+                prop = root.get_full_property(net_active, X.AnyPropertyType)
+                wid = prop.value[0] if prop and len(prop.value) else 0
+                if not wid:
+                    return None, None, None
+                win = disp.create_resource_object("window", wid)
+                pid_prop = win.get_full_property(net_pid, X.AnyPropertyType)
+                name_prop = win.get_full_property(net_name, 0)
+                title = name_prop.value if name_prop else win.get_wm_name()
+            if isinstance(title, bytes):
+                title = title.decode("utf-8", "replace")
+            pid = int(pid_prop.value[0]) if pid_prop and len(pid_prop.value) else None
+            return wid, pid, title
+
+        return _x11_foreground
+    except Exception as e:
+        logger.debug(f"Native foreground-window query unavailable, using pygetwindow: {e}")
+        return None
+
+
+_posix_foreground = _resolve_posix_foreground()
+
+
+def _foreground() -> tuple[Optional[int], Optional[int], Optional[str]]:
+    """Return (handle, pid, title) of the foreground window.
+
+    On Windows the pid is left None and resolved from the HWND only when
+    needed; off Windows the native query returns it directly.
+    """
+    if os.name == 'nt':
         try:
-            active_win = pygetwindow.getActiveWindow()
+            hwnd = _GetForegroundWindow()
+            if not hwnd:
+                return None, None, None
+            with _TITLE_BUF_LOCK:
+                n = _GetWindowTextW(hwnd, _TITLE_BUF, len(_TITLE_BUF))
+                title = _TITLE_BUF.value[:n]
+            return hwnd, None, title
+        except Exception:
+            return None, None, None
+    if _posix_foreground is not None:
+        try:
+            return _posix_foreground()
         except Exception:
             pass
+    try:
+        import pygetwindow
 
-        if active_win:
-            try:
-                # Windows-specific: get PID from window handle
-                if os.name == 'nt':
-                    import win32process
-                    import win32gui
-                    hwnd = active_win._hWnd
-                    _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                    try:
-                        proc = psutil.Process(pid)
-                        return proc.name(), pid
-                    except Exception:
-                        pass
-            except Exception:
-                pass
+        win = pygetwindow.getActiveWindow()
+        if win:
+            return None, None, win.title
+    except Exception:
+        pass
+    return None, None, None
+
+
+def _get_active_window_title() -> Optional[str]:
+    return _foreground()[2]
+
+
+# Browser process names, matched in one C-level scan; used by the click
+# handler and the non-Windows process-scan fallback
+_BROWSER_RE = re.compile(r"chrome|msedge|firefox|brave|opera", re.IGNORECASE)
+# Chrome windows whose owning process could not be resolved
+_CHROME_TITLE_RE = re.compile(r"google chrome", re.IGNORECASE)
+
+# psutil.Process objects reused across clicks (constructing one costs a
+# kernel lookup); kept in LRU order and bounded so long sessions don't
+# accumulate dead PIDs.
+_PROC_CACHE: OrderedDict[int, psutil.Process] = OrderedDict()
+_PROC_CACHE_MAX = 128
+# The listener worker and find_pid_for_window_title (called from the API's
+# I/O threads) share the cache; the lookup, insert and eviction must not
+# interleave or another thread's eviction can break move_to_end.
+_PROC_CACHE_LOCK = Lock()
+
+
+def _proc(pid: int) -> psutil.Process:
+    with _PROC_CACHE_LOCK:
+        p = _PROC_CACHE.get(pid)
+        # is_running() compares the process creation time, so a PID recycled by a
+        # new process is detected instead of returning the old process's name
+        if p is None or not p.is_running():
+            p = psutil.Process(pid)
+            _PROC_CACHE[pid] = p
+        _PROC_CACHE.move_to_end(pid)
+        if len(_PROC_CACHE) > _PROC_CACHE_MAX:
+            _PROC_CACHE.popitem(last=False)
+        return p
+
+
+def _find_browser_fallback(active_title: Optional[str]) -> tuple[Optional[str], Optional[int]]:
+    """Scan running processes for a browser (used only when there is no HWND to ask)."""
+    title = active_title.lower() if active_title else None
+    # process_iter already reads the requested attrs under oneshot(); ask only
+    # for the name so the (expensive) cmdline is read just for browsers.
+    for proc in psutil.process_iter(['name']):
+        try:
+            # Match browser processes
+            if _BROWSER_RE.search(proc.info['name']) is not None:
+                # If we have an active window title, try to match it to browser tabs
+                if title:
+                    cmdline = ' '.join(proc.cmdline()).lower()
+                    if title in cmdline or _BROWSER_RE.search(title) is not None:
+                        return proc.info['name'], proc.pid
+                else:
+                    # No title to match - return first browser found
+                    return proc.info['name'], proc.pid
+        except Exception:
+            continue
+    return None, None
+
+
+def _get_active_process_info(
+    fg: Optional[tuple[Optional[int], Optional[int], Optional[str]]] = None
+) -> tuple[Optional[str], Optional[int]]:
+    """Return (process_name, pid) for the foreground window.
+
+    Pass the result of _foreground() to reuse a lookup already done.
+    """
+    try:
+        hwnd, pid, title = fg if fg is not None else _foreground()
+
+        if os.name == 'nt':
+            # Windows: the window handle gives the owning PID directly; never
+            # fall back to scanning every process on the system.
+            if hwnd:
+                try:
+                    _, pid = _GetWindowThreadProcessId(hwnd)
+                    return _proc(pid).name(), pid
+                except Exception:
+                    pass
+            return None, None
 
-        # Fallback: scan for known browser processes
-        browser_names = ['chrome', 'msedge', 'firefox', 'brave', 'opera']
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+        if pid:
             try:
-                name = proc.info['name'].lower()
-                # Match browser processes
-                if any(b in name for b in browser_names):
-                    # If we have an active window title, try to match it to browser tabs
-                    if active_win and active_win.title:
-                        title = active_win.title.lower()
-                        cmdline = ' '.join(proc.info.get('cmdline', [])).lower()
-                        if title in cmdline or any(b in title for b in browser_names):
-                            return proc.info['name'], proc.info['pid']
-                    else:
-                        # No title to match - return first browser found
-                        return proc.info['name'], proc.info['pid']
+                return _proc(pid).name(), pid
             except Exception:
-                continue
-
-        return None, None
+                pass
+        return _find_browser_fallback(title)
     except Exception as e:
         logger.error(f"Error getting process info: {e}")
         return None, None
 
-        # Generic fallback: try to guess process by active window title
-        win = pygetwindow.getActiveWindow()
-        if win:
-            title = getattr(win, "title", None) or getattr(win, "name", None)
-            if title:
-                # Try to find a process whose name or cmdline contains parts of the title
-                title_lower = title.lower()
-                for p in psutil.process_iter(attrs=["pid", "name", "cmdline"]):
-                    try:
-                        name = (p.info.get("name") or "")
-                        cmd = " ".join(p.info.get("cmdline") or [])
-                        if name and name.lower() in title_lower:
-                            return name, p.info.get("pid")
-                        if cmd and any(part.lower() in title_lower for part in (name,)):
-                            return name, p.info.get("pid")
-                    except Exception:
-                        continue
 
-        return None, None
-    except Exception:
-        return None, None
+# Owner of each recently focused window: a window's process never changes, so
+# (app_name, pid) is cached per handle and switching back to a window skips
+# Win32/psutil. The title is always read fresh since tabs change it in place;
+# entries expire in case a handle value is reused by a new window.
+_CTX_CACHE_TTL = 30.0  # seconds
+_CTX_CACHE_MAX = 32
+_ctx_cache: OrderedDict[int, tuple[float, Optional[str], Optional[int]]] = OrderedDict()
+
+
+def _get_window_context() -> tuple[Optional[str], Optional[int], Optional[str]]:
+    """Return (app_name, pid, window_title) for the foreground window."""
+    fg = _foreground()
+    hwnd, _, title = fg
+    now = time.monotonic()
+    if hwnd is not None:
+        cached = _ctx_cache.get(hwnd)
+        if cached is not None and now - cached[0] < _CTX_CACHE_TTL:
+            _ctx_cache.move_to_end(hwnd)
+            return cached[1], cached[2], title
+    app_name, pid = _get_active_process_info(fg)
+    if hwnd is not None and pid is not None:
+        _ctx_cache[hwnd] = (now, app_name, pid)
+        _ctx_cache.move_to_end(hwnd)
+        if len(_ctx_cache) > _CTX_CACHE_MAX:
+            _ctx_cache.popitem(last=False)
+    return app_name, pid, title
+
+
+# Monitor rectangles only change on hotplug or resolution changes, so they are
+# enumerated at most every _MON_CACHE_TTL seconds instead of on every click.
+_MON_CACHE_TTL = 10.0  # seconds
+_MON_CACHE = {"mons": None, "ts": 0.0, "last_hit": None}
+
+
+def _enumerate_monitors() -> list[tuple[int, int, int, int, int]]:
+    """Return (left, top, right, bottom, display_id) for each physical monitor."""
+    if os.name == 'nt':
+        try:
+            return [
+                (left, top, right, bottom, idx)
+                for idx, (_, _, (left, top, right, bottom)) in enumerate(_EnumDisplayMonitors(), 1)
+            ]
+        except Exception as e:
+            logger.warning(f"Win32 monitor detection failed: {e}")
+    from monitors import get_monitor_rects
 
+    # refresh: this is already rate-limited by _MON_CACHE_TTL, so the cached
+    # layout in monitors.py is re-enumerated rather than reused
+    return [
+        (left, top, right, bottom, idx)
+        for idx, (left, top, right, bottom) in enumerate(get_monitor_rects(refresh=True), 1)
+    ]
 
 
+def _get_monitors() -> list[tuple[int, int, int, int, int]]:
+    now = time.monotonic()
+    mons = _MON_CACHE["mons"]
+    if mons is None or now - _MON_CACHE["ts"] >= _MON_CACHE_TTL:
+        mons = _enumerate_monitors()
+        _MON_CACHE.update(mons=mons, ts=now, last_hit=None)
+        # Log monitor layout whenever it is (re)enumerated
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Monitor layout:")
+            for left, top, right, bottom, idx in mons:
+                logger.debug("Monitor %d: %d,%d %dx%d", idx, left, top, right - left, bottom - top)
+    return mons
 
 
-def _get_display_id_for_point(x: int, y: int) -> int:
-    """Enhanced display mapping with Win32 API support and device pixel ratio handling."""
-    try:
-        # Try Win32 API first for more accurate monitor info
+def _invalidate_monitors() -> None:
+    """Force the next _get_monitors() call to re-enumerate."""
+    _MON_CACHE.update(mons=None, last_hit=None)
+
+
+def _hit_monitor(mons: list[tuple[int, int, int, int, int]], x: int, y: int) -> Optional[int]:
+    """Return the display_id containing (x, y), or None.
+
+    Consecutive clicks almost always land on the same monitor, so the monitor
+    hit last time is tested first and the scan only runs when it misses.
+    """
+    last = _MON_CACHE["last_hit"]
+    if last is not None and last[0] <= x < last[2] and last[1] <= y < last[3]:
+        return last[4]
+    for mon in mons:
+        if mon[0] <= x < mon[2] and mon[1] <= y < mon[3]:
+            _MON_CACHE["last_hit"] = mon
+            return mon[4]
+    return None
+
+
+_DPI_SCALE: Optional[float] = None
+
+
+def _get_dpi_scale() -> float:
+    """System DPI scale (dpi / 96), queried once per session.
+
+    Resolved on first use rather than at import so it reflects the DPI
+    awareness capture.py sets for the process.
+    """
+    global _DPI_SCALE
+    if _DPI_SCALE is None:
+        scale = 1.0
         if os.name == 'nt':
             try:
-                import win32api
-                monitor = win32api.MonitorFromPoint((x, y))
-                if monitor:
-                    info = win32api.GetMonitorInfo(monitor)
-                    # Convert monitor number to 1-based index
-                    display_num = len(win32api.EnumDisplayMonitors()) 
-                    for i, m in enumerate(win32api.EnumDisplayMonitors(), 1):
-                        if m[0] == monitor:
-                            logger.info(f"Win32API: Point ({x},{y}) matched to monitor {i} of {display_num}")
-                            return i
+                scale = ctypes.windll.user32.GetDpiForSystem() / 96.0 or 1.0
             except Exception as e:
-                logger.warning(f"Win32 monitor detection failed: {e}")
-
-        # Fallback to MSS
-        with mss.mss() as sct:
-            # Skip virtual screen, get physical monitors
-            real_monitors = sct.monitors[1:]
-            
-            # Log monitor layout
-            logger.info("Monitor layout:")
-            for idx, mon in enumerate(real_monitors, 1):
-                logger.info(f"Monitor {idx}: {mon['left']},{mon['top']} {mon['width']}x{mon['height']}")
-
-            # Try direct match first
-            for idx, mon in enumerate(real_monitors, 1):
-                if (mon['left'] <= x < mon['left'] + mon['width'] and 
-                    mon['top'] <= y < mon['top'] + mon['height']):
-                    logger.info(f"MSS direct match: ({x},{y}) -> monitor {idx}")
+                logger.warning(f"GetDpiForSystem failed: {e}")
+        _DPI_SCALE = scale
+    return _DPI_SCALE
+
+
+def _get_display_id_for_point(x: int, y: int) -> int:
+    """Enhanced display mapping with Win32 API support and device pixel ratio handling."""
+    try:
+        mons = _get_monitors()
+
+        # Try direct match first
+        idx = _hit_monitor(mons, x, y)
+        if idx is not None:
+            logger.debug("Point (%s,%s) matched to monitor %d of %d", x, y, idx, len(mons))
+            return idx
+
+        # Try with device pixel ratio adjustment
+        try:
+            scale = _get_dpi_scale()
+            if scale != 1.0:
+                scaled_x = int(x / scale)
+                scaled_y = int(y / scale)
+                idx = _hit_monitor(mons, scaled_x, scaled_y)
+                if idx is not None:
+                    logger.debug("Scaled match: (%s,%s) -> (%s,%s) -> monitor %d", x, y, scaled_x, scaled_y, idx)
                     return idx
+        except Exception as e:
+            logger.warning(f"DPI scaling adjustment failed: {e}")
 
-            # Try with device pixel ratio adjustment
-            try:
-                if os.name == 'nt':
-                    import ctypes
-                    user32 = ctypes.windll
-                    dpi = user32.user32.GetDpiForSystem()
-                    scale = dpi / 96.0
-                    scaled_x = int(x / scale)
-                    scaled_y = int(y / scale)
-                    for idx, mon in enumerate(real_monitors, 1):
-                        if (mon['left'] <= scaled_x < mon['left'] + mon['width'] and 
-                            mon['top'] <= scaled_y < mon['top'] + mon['height']):
-                            logger.info(f"MSS scaled match: ({x},{y}) -> ({scaled_x},{scaled_y}) -> monitor {idx}")
-                            return idx
-            except Exception as e:
-                logger.warning(f"DPI scaling adjustment failed: {e}")
+        # If no match, use primary monitor
+        logger.debug("No monitor match for (%s,%s), using primary (1)", x, y)
+        return 1
 
-            # If no match, use primary monitor
-            logger.info(f"No monitor match for ({x},{y}), using primary (1)")
-            return 1
-            
     except Exception as e:
         logger.error(f"Display mapping failed: {e}")
         return 1
 
 
+# Process names find_pid_for_window_title considers in its psutil fallback
+_BROWSER_KEYS = ("chrome", "msedge", "firefox", "acrord", "acrobat")
+
+
 def find_pid_for_window_title(title: Optional[str]) -> tuple[Optional[str], Optional[int]]:
     """Return (process_name, pid) for a window whose title contains the given string.
 
@@ -179,44 +410,45 @@ def find_pid_for_window_title(title: Optional[str]) -> tuple[Optional[str], Opti
     """
     if not title:
         return None, None
+    title_lower = title.lower()
     try:
         # Prefer Windows API where available
         if os.name == "nt":
-            try:
-                import win32gui
-                import win32process
-
-                matches = []
+            found = []
 
-                def _cb(hwnd, _):
-                    try:
-                        text = win32gui.GetWindowText(hwnd)
-                        if text and title.lower() in text.lower():
-                            _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                            matches.append(pid)
-                    except Exception:
-                        pass
-                    return True
+            def _cb(hwnd, _):
+                try:
+                    text = _GetWindowText(hwnd)
+                    if text and title_lower in text.lower():
+                        _, pid = _GetWindowThreadProcessId(hwnd)
+                        found.append((_proc(pid).name(), pid))
+                        # Stop enumerating at the first window we can resolve
+                        return False
+                except Exception:
+                    pass
+                return True
 
-                win32gui.EnumWindows(_cb, None)
-                for pid in matches:
-                    try:
-                        p = psutil.Process(pid)
-                        return p.name(), pid
-                    except Exception:
-                        continue
+            try:
+                _EnumWindows(_cb, None)
             except Exception:
+                # pywin32 raises when the callback ends enumeration early
                 pass
+            if found:
+                return found[0]
 
         # Fallback: scan processes for likely browsers and check cmdline/title hints
-        title_lower = title.lower()
-        for p in psutil.process_iter(attrs=["pid", "name", "cmdline"]):
+        for p in psutil.process_iter(attrs=["pid", "name"]):
             try:
                 name = (p.info.get("name") or "")
-                cmd = " ".join(p.info.get("cmdline") or [])
-                if name and any(k in name.lower() for k in ("chrome", "msedge", "firefox", "acrord", "acrobat")):
-                    if title_lower in name.lower() or title_lower in cmd.lower():
-                        return name, p.info.get("pid")
+                name_lower = name.lower()
+                # Filter on name first; cmdline is the expensive read per process
+                if not any(k in name_lower for k in _BROWSER_KEYS):
+                    continue
+                if title_lower in name_lower:
+                    return name, p.info.get("pid")
+                cmd = " ".join(p.cmdline() or []).lower()
+                if title_lower in cmd:
+                    return name, p.info.get("pid")
             except Exception:
                 continue
     except Exception:
@@ -229,133 +461,113 @@ class ListenerConfig:
     on_click: Callable[[dict], None]
 
 
+WM_CLIPBOARDUPDATE = 0x031D
+# Upper bound on waiting for the browser to update the clipboard after Ctrl+C
+# (the old poll's 10 x 50 ms); change notifications usually end it far sooner
+_CLIPBOARD_WAIT_S = 0.5
+_CLIPBOARD_POLL_S = 0.05
+
+
+class _ClipboardWatcher:
+    """Set ``changed`` whenever the Windows clipboard is updated.
+
+    Registers a hidden message-only window with AddClipboardFormatListener and
+    pumps its messages on a daemon thread, so callers can wait for the copy to
+    land instead of polling the clipboard.
+    """
+
+    def __init__(self) -> None:
+        self.changed = Event()
+        self._hwnd = None
+        self._ready = Event()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait(1.0)
+
+    @property
+    def available(self) -> bool:
+        return self._hwnd is not None
+
+    def _run(self) -> None:
+        try:
+            def _wndproc(hwnd, msg, wparam, lparam):
+                if msg == WM_CLIPBOARDUPDATE:
+                    self.changed.set()
+                    return 0
+                return win32gui.DefWindowProc(hwnd, msg, wparam, lparam)
+
+            wc = win32gui.WNDCLASS()
+            wc.lpszClassName = "DesktopCaptureClipboardWatcher"
+            wc.lpfnWndProc = _wndproc
+            wc.hInstance = win32api.GetModuleHandle(None)
+            atom = win32gui.RegisterClass(wc)
+            hwnd = win32gui.CreateWindowEx(
+                0, atom, "", 0, 0, 0, 0, 0, win32con.HWND_MESSAGE, 0, wc.hInstance, None
+            )
+            add_listener = ctypes.windll.user32.AddClipboardFormatListener
+            add_listener.argtypes = [wintypes.HWND]
+            add_listener.restype = wintypes.BOOL
+            if not add_listener(hwnd):
+                raise OSError("AddClipboardFormatListener failed")
+            self._hwnd = hwnd
+        except Exception as e:
+            logger.warning(f"Clipboard change notifications unavailable, falling back to polling: {e}")
+            return
+        finally:
+            self._ready.set()
+        win32gui.PumpMessages()
+
+
+_UTC = timezone.utc
+
+
+def _iso(ns: int) -> str:
+    """ISO-8601 UTC string for a time.time_ns() value."""
+    return datetime.fromtimestamp(ns * 1e-9, _UTC).isoformat()
+
+
+_LEFT_BUTTON = Button.left
+
+# Queue marker telling the click worker to exit.
+_WORKER_STOP = object()
+
+
 class GlobalClickListener:
     def __init__(self, config: ListenerConfig) -> None:
         self.config = config
         self._listener: Optional[mouse.Listener] = None
+        # pynput calls on_click on its own hook thread; everything slow (Win32,
+        # psutil, Ctrl+C clipboard round-trip) runs on this worker instead so
+        # the hook returns immediately and no mouse events are delayed or lost.
         self._thread: Optional[Thread] = None
+        # Bounded so a stalled worker can't grow memory without limit
+        self._queue: queue.Queue = queue.Queue(maxsize=1024)
+        # Created lazily on the worker the first time a browser click needs it
+        self._clipboard_watcher: Optional[_ClipboardWatcher] = None
+        # (x, y, ts_ns, context) of the previous click, for double-click reuse
+        self._last: Optional[tuple] = None
 
     def start(self) -> None:
         if self._listener and self._listener.running:
             return
+        # The layout may have changed while the listener was stopped
+        _invalidate_monitors()
 
         def on_click(x: int, y: int, button, pressed: bool) -> None:
+            if not pressed:
+                return
+            if button is not _LEFT_BUTTON:
+                return
+            # Timestamp taken here so queueing delay doesn't skew the record
             try:
-                if not pressed or str(button) != "Button.left":
-                    return
-                # Gather context first so we can log a single, informative line
-                app_name, pid = _get_active_process_info()
-                title = _get_active_window_title()
-                display_id = _get_display_id_for_point(x, y)
-                # Verbose log for every OS click so we can diagnose missed Acrobat events
-                try:
-                    logger.info(
-                        f"OS click detected: x={x}, y={y}, button={button}, "
-                        f"app_name={app_name}, process_id={pid}, window_title={title}, display_id={display_id}"
-                    )
-                except Exception:
-                    # Non-fatal logging failure should not stop processing
-                    logger.debug("OS click detected (failed to format full info)")
-                click_record = {
-                    "timestamp_utc": datetime.now(timezone.utc).isoformat(),
-                    "x": x,
-                    "y": y,
-                    "app_name": app_name,
-                    "process_id": pid,
-                    "window_title": title,
-                    "display_id": display_id,
-                    "source": "os",
-                }
-                # If this looks like a browser window (Chrome/Edge/Firefox), attempt a
-                # simple clipboard-based selection extraction (Ctrl+C). This is a
-                # lightweight, cross-browser approach that works for typical web pages
-                # and Chrome's built-in PDF viewer. Keep this optional and non-fatal.
-                try:
-                    name_lower = (app_name or "").lower()
-                    title_lower = (title or "").lower()
-                    if any(b in name_lower for b in ("chrome", "msedge", "firefox", "brave", "opera")) or "google chrome" in title_lower:
-                        import time
-                        try:
-                            import win32clipboard
-                        except Exception:
-                            win32clipboard = None
-
-                        prev_clip = None
-                        if win32clipboard:
-                            try:
-                                win32clipboard.OpenClipboard()
-                                try:
-                                    prev_clip = win32clipboard.GetClipboardData(win32clipboard.CF_UNICODETEXT)
-                                except Exception:
-                                    prev_clip = None
-                                finally:
-                                    win32clipboard.CloseClipboard()
-                            except Exception:
-                                prev_clip = None
-
-                        try:
-                            logger.info("Attempting clipboard-based selection extraction (Ctrl+C) for browser window")
-                        except Exception:
-                            pass
-                        try:
-                            pyautogui.hotkey('ctrl', 'c')
-                        except Exception:
-                            logger.warning("pyautogui.hotkey('ctrl','c') failed or unavailable")
-
-                        sel_text = None
-                        if win32clipboard:
-                            for _ in range(10):
-                                try:
-                                    win32clipboard.OpenClipboard()
-                                    try:
-                                        data = win32clipboard.GetClipboardData(win32clipboard.CF_UNICODETEXT)
-                                        if data and data != prev_clip:
-                                            sel_text = data
-                                            win32clipboard.CloseClipboard()
-                                            break
-                                    except Exception:
-                                        pass
-                                    finally:
-                                        try:
-                                            win32clipboard.CloseClipboard()
-                                        except Exception:
-                                            pass
-                                except Exception:
-                                    pass
-                                time.sleep(0.05)
-
-                        if sel_text:
-                            click_record["text"] = sel_text.strip()
-                            try:
-                                logger.info(f"Clipboard selection extracted ({len(sel_text)} chars)")
-                            except Exception:
-                                pass
-                        else:
-                            try:
-                                logger.info("No clipboard selection detected after Ctrl+C")
-                            except Exception:
-                                pass
-
-                        # Restore previous clipboard content
-                        if win32clipboard and prev_clip is not None:
-                            try:
-                                win32clipboard.OpenClipboard()
-                                try:
-                                    win32clipboard.EmptyClipboard()
-                                    win32clipboard.SetClipboardData(win32clipboard.CF_UNICODETEXT, prev_clip)
-                                finally:
-                                    win32clipboard.CloseClipboard()
-                            except Exception:
-                                pass
-                except Exception:
-                    # Non-fatal: if extraction fails, continue without text
-                    pass
-                logger.info(f"Calling on_click callback: {click_record}")
-                self.config.on_click(click_record)
-            except Exception as e:
-                # Log the exception but don't crash the listener
-                logger.error(f"Error handling click event: {e}", exc_info=True)
-
+                self._queue.put_nowait((x, y, time.time_ns()))
+            except queue.Full:
+                # Never block the hook thread; losing a click beats lagging input
+                logger.warning("Click queue full, dropping click at (%s,%s)", x, y)
+
+        if not (self._thread and self._thread.is_alive()):
+            self._thread = Thread(target=self._worker_loop, daemon=True)
+            self._thread.start()
         try:
             self._listener = mouse.Listener(on_click=on_click)
             self._listener.daemon = True  # type: ignore[attr-defined]
@@ -365,12 +577,191 @@ class GlobalClickListener:
             self._listener = None
             raise
 
+    def _worker_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _WORKER_STOP:
+                break
+            x, y, ts_ns = item
+            try:
+                self._handle_click(x, y, ts_ns)
+            except Exception as e:
+                # Log the exception but don't stop the worker
+                logger.error(f"Error handling click event: {e}", exc_info=True)
+
+    def _handle_click(self, x: int, y: int, ts_ns: int) -> None:
+        # The second click of a double-click lands on the same window and
+        # monitor, so reuse the context gathered for the first one
+        last = self._last
+        if (
+            last is not None
+            and 0 <= ts_ns - last[2] <= _DOUBLE_CLICK_NS
+            and abs(x - last[0]) <= _DOUBLE_CLICK_PX
+            and abs(y - last[1]) <= _DOUBLE_CLICK_PX
+        ):
+            app_name, pid, title, display_id = last[3]
+        else:
+            # Gather context first so we can log a single, informative line
+            app_name, pid, title = _get_window_context()
+            display_id = _get_display_id_for_point(x, y)
+        self._last = (x, y, ts_ns, (app_name, pid, title, display_id))
+        # One line per OS click so we can diagnose missed Acrobat events;
+        # %-style so the message is only formatted if INFO is enabled
+        logger.info(
+            "OS click detected: x=%s, y=%s, app_name=%s, process_id=%s, window_title=%s, display_id=%s",
+            x, y, app_name, pid, title, display_id,
+        )
+        click_record = {
+            "timestamp_ns": ts_ns,
+            "timestamp_utc": _iso(ts_ns),
+            "x": x,
+            "y": y,
+            "app_name": app_name,
+            "process_id": pid,
+            "window_title": title,
+            "display_id": display_id,
+            "source": "os",
+        }
+        # If this looks like a browser window (Chrome/Edge/Firefox), attempt a
+        # simple clipboard-based selection extraction (Ctrl+C). This is a
+        # lightweight, cross-browser approach that works for typical web pages
+        # and Chrome's built-in PDF viewer. Keep this optional and non-fatal.
+        try:
+            if (app_name and _BROWSER_RE.search(app_name)) or (title and _CHROME_TITLE_RE.search(title)):
+                sel_text = self._extract_browser_selection()
+                if sel_text:
+                    click_record["text"] = sel_text.strip()
+        except Exception:
+            # Non-fatal: if extraction fails, continue without text
+            pass
+        logger.debug("Calling on_click callback: %s", click_record)
+        self.config.on_click(click_record)
+
+    def _extract_browser_selection(self) -> Optional[str]:
+        """Copy the current selection with Ctrl+C and return it, restoring the clipboard."""
+        prev_clip = None
+        if win32clipboard:
+            try:
+                win32clipboard.OpenClipboard()
+                try:
+                    prev_clip = win32clipboard.GetClipboardData(win32clipboard.CF_UNICODETEXT)
+                except Exception:
+                    prev_clip = None
+                finally:
+                    win32clipboard.CloseClipboard()
+            except Exception:
+                prev_clip = None
+
+        watcher = None
+        seq_before = None
+        if win32clipboard:
+            if self._clipboard_watcher is None:
+                self._clipboard_watcher = _ClipboardWatcher()
+            if self._clipboard_watcher.available:
+                watcher = self._clipboard_watcher
+                watcher.changed.clear()
+            try:
+                # The sequence number, not the event, decides whether the
+                # clipboard changed: a notification from our own restore on
+                # the previous click may still be in flight and set the event.
+                seq_before = win32clipboard.GetClipboardSequenceNumber()
+            except Exception:
+                seq_before = None
+
+        logger.debug("Attempting clipboard-based selection extraction (Ctrl+C) for browser window")
+        try:
+            import pyautogui
+
+            pyautogui.hotkey('ctrl', 'c')
+        except Exception:
+            logger.warning("pyautogui.hotkey('ctrl','c') failed or unavailable")
+
+        sel_text = None
+        # Reading the copy and restoring the previous text share one
+        # OpenClipboard/CloseClipboard pair: every open takes a system-wide lock.
+        restored = False
+        if win32clipboard:
+            deadline = time.monotonic() + _CLIPBOARD_WAIT_S
+            while True:
+                changed = True
+                if seq_before is not None:
+                    try:
+                        changed = win32clipboard.GetClipboardSequenceNumber() != seq_before
+                    except Exception:
+                        changed = True
+                read_ok = False
+                if changed:
+                    try:
+                        win32clipboard.OpenClipboard()
+                        try:
+                            data = win32clipboard.GetClipboardData(win32clipboard.CF_UNICODETEXT)
+                            read_ok = True
+                            if data and data != prev_clip:
+                                sel_text = data
+                                restored = self._restore_clipboard(prev_clip)
+                        except Exception:
+                            pass
+                        finally:
+                            win32clipboard.CloseClipboard()
+                    except Exception:
+                        pass
+                    # With a sequence number, one changed read is the copy;
+                    # without one, keep polling until the text differs. A
+                    # failed open (browser still writing) retries either way.
+                    if sel_text or (read_ok and seq_before is not None):
+                        break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                if watcher is not None:
+                    # Wakes on the copy's notification; the poll interval
+                    # still bounds each wait in case one is missed
+                    watcher.changed.wait(min(remaining, _CLIPBOARD_POLL_S))
+                    watcher.changed.clear()
+                else:
+                    time.sleep(min(remaining, _CLIPBOARD_POLL_S))
+
+        if sel_text:
+            logger.debug("Clipboard selection extracted (%d chars)", len(sel_text))
+        else:
+            logger.debug("No clipboard selection detected after Ctrl+C")
+
+        # Restore previous clipboard content if that didn't already happen above
+        if win32clipboard and not restored and prev_clip is not None:
+            try:
+                win32clipboard.OpenClipboard()
+                try:
+                    self._restore_clipboard(prev_clip)
+                finally:
+                    win32clipboard.CloseClipboard()
+            except Exception:
+                pass
+        return sel_text
+
+    @staticmethod
+    def _restore_clipboard(prev_clip: Optional[str]) -> bool:
+        """Put prev_clip back on an already opened clipboard."""
+        if prev_clip is None:
+            return True
+        try:
+            win32clipboard.EmptyClipboard()
+            win32clipboard.SetClipboardData(win32clipboard.CF_UNICODETEXT, prev_clip)
+            return True
+        except Exception:
+            return False
+
     def stop(self) -> None:
         if self._listener:
             self._listener.stop()
             self._listener = None
+        if self._thread:
+            # Clicks already queued are still processed before the worker exits
+            try:
+                self._queue.put(_WORKER_STOP, timeout=2.0)
+            except queue.Full:
+                logger.warning("Click queue full, worker not signalled to stop")
+            self._thread.join(timeout=2.0)
+            self._thread = None
 
     def is_running(self) -> bool:
         return self._listener is not None and self._listener.running
-
-
@@ -1,19 +1,34 @@
+import atexit
 import csv
 import json
 import logging
 import os
+import queue
+import time
 from datetime import datetime, timezone
-from threading import Lock
+from threading import Lock, Thread
 from typing import Dict, Any
 
 logger = logging.getLogger(__name__)
 
 
+# (epoch second, formatted "YYYY-MM-DDTHH-MM-SS") of the last utc_iso_millis()
+# call without a datetime; swapped as one tuple so threads never see a mix.
+_SEC_CACHE: tuple[int, str] = (-1, "")
+
+
 def utc_iso_millis(dt: datetime | None = None) -> str:
-    if dt is None:
-        dt = datetime.now(timezone.utc)
     # Format: YYYY-MM-DDTHH-MM-SS.mmmZ (note dashes instead of colons for Windows-safe filenames)
-    return dt.strftime("%Y-%m-%dT%H-%M-%S.%f")[:-3] + "Z"
+    if dt is not None:
+        return dt.strftime("%Y-%m-%dT%H-%M-%S.%f")[:-3] + "Z"
+    global _SEC_CACHE
+    t = time.time()
+    sec = int(t)
+    cache = _SEC_CACHE
+    if cache[0] != sec:
+        cache = (sec, time.strftime("%Y-%m-%dT%H-%M-%S", time.gmtime(sec)))
+        _SEC_CACHE = cache
+    return f"{cache[1]}.{min(999, int((t - sec) * 1000)):03d}Z"
 
 
 def day_folder(base_dir: str) -> str:
@@ -23,98 +38,302 @@ def day_folder(base_dir: str) -> str:
     return folder
 
 
+# Queue marker telling the click-log writer thread to exit.
+_LOG_STOP = object()
+
+# Fields every logged record carries, with their default when missing
+_KNOWN_DEFAULTS = (
+    ("x", None),
+    ("y", None),
+    ("app_name", None),
+    ("process_id", None),
+    ("window_title", None),
+    ("display_id", None),
+    ("source", "os"),
+    ("url_or_path", None),
+    ("text", None),
+    ("screenshot_path", None),
+)
+
+_CSV_HEADER = [
+    "timestamp_utc",
+    "x",
+    "y",
+    "app_name",
+    "process_id",
+    "window_title",
+    "display_id",
+    "source",
+    "url_or_path",
+    "doc_path",
+    "text",
+    "screenshot_path",
+]
+
+
+# NDJSON line encoder, returning UTF-8 bytes with the trailing newline. orjson,
+# when installed, is several times faster and appends the newline in C;
+# otherwise reuse one stdlib encoder (json.dumps with non-default options
+# builds a new one per call).
+try:
+    import orjson
+
+    def _ndjson_line(record: Dict[str, Any]) -> bytes:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    _encode = json.JSONEncoder(ensure_ascii=False).encode
+
+    def _ndjson_line(record: Dict[str, Any]) -> bytes:
+        return (_encode(record) + "\n").encode("utf-8")
+
+
+def _csv_row(record: Dict[str, Any]) -> list:
+    return [
+        record.get("timestamp_utc"),
+        record.get("x"),
+        record.get("y"),
+        record.get("app_name"),
+        record.get("process_id"),
+        record.get("window_title"),
+        record.get("display_id"),
+        record.get("source"),
+        record.get("url_or_path"),
+        record.get("doc_path"),
+        (record.get("text") or "").replace("\n", " ").strip(),
+        record.get("screenshot_path"),
+    ]
+
+
 class ClickLogger:
     def __init__(self, output_base: str) -> None:
         self.output_base = output_base
         os.makedirs(self.output_base, exist_ok=True)
-        self._csv_lock = Lock()
-        self._ndjson_lock = Lock()
+        # Records are appended by a writer thread that keeps both files open
+        # and flushes once per batch, instead of two open/close per click.
+        self._queue: queue.Queue = queue.Queue()
+        self._flush_batch_size = 256
+        self._writer_thread: Thread | None = None
+        self._writer_lock = Lock()
+        self._atexit_registered = False
+        self._day: str | None = None
+        self._ndjson_f = None
+        self._csv_f = None
+        self._csv_writer = None
+        self._day_cache: tuple[str, str, str] | None = None
+
+    def _get_paths(self) -> tuple[str, str, str]:
+        """Return (day, csv_path, ndjson_path) for the current UTC day.
+
+        The folder is created once per day rather than on every access.
+        """
+        day = time.strftime("%Y-%m-%d", time.gmtime())
+        cache = self._day_cache
+        if cache is None or cache[0] != day:
+            folder = os.path.join(self.output_base, day)
+            os.makedirs(folder, exist_ok=True)
+            cache = (day, os.path.join(folder, "clicks.csv"), os.path.join(folder, "clicks.ndjson"))
+            self._day_cache = cache
+        return cache
 
     @property
     def csv_path(self) -> str:
-        folder = day_folder(self.output_base)
-        return os.path.join(folder, "clicks.csv")
+        return self._get_paths()[1]
 
     @property
     def ndjson_path(self) -> str:
-        folder = day_folder(self.output_base)
-        return os.path.join(folder, "clicks.ndjson")
-
-    def _ensure_csv_header(self) -> None:
-        path = self.csv_path
-        if not os.path.exists(path) or os.path.getsize(path) == 0:
-            with open(path, mode="w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    "timestamp_utc",
-                    "x",
-                    "y",
-                    "app_name",
-                    "process_id",
-                    "window_title",
-                    "display_id",
-                    "source",
-                    "url_or_path",
-                    "doc_path",
-                    "text",
-                    "screenshot_path",
-                ])
+        return self._get_paths()[2]
 
-    def log_click(self, record: Dict[str, Any]) -> None:
-        try:
-            # Normalize minimal fields
-            record = {
-                "timestamp_utc": record.get("timestamp_utc", utc_iso_millis()),
-                "x": record.get("x"),
-                "y": record.get("y"),
-                "app_name": record.get("app_name"),
-                "process_id": record.get("process_id"),
-                "window_title": record.get("window_title"),
-                "display_id": record.get("display_id"),
-                "source": record.get("source", "os"),
-                "url_or_path": record.get("url_or_path"),
-                "text": record.get("text"),
-                "screenshot_path": record.get("screenshot_path"),
-                **{k: v for k, v in record.items() if k not in {
-                    "timestamp_utc","x","y","app_name","process_id","window_title","display_id","source","url_or_path","text","screenshot_path"
-                }}
-            }
-
-            logger.info(f"Logging click: source={record.get('source')}, x={record.get('x')}, y={record.get('y')}, text={record.get('text')[:50] if record.get('text') else None}")
-
-            # NDJSON
+    def _open_files(self) -> None:
+        """Open (or on UTC day rollover, reopen) the day's NDJSON and CSV files."""
+        day, csv_path, ndjson_path = self._get_paths()
+        if day == self._day and self._ndjson_f is not None and self._csv_f is not None:
+            return
+        self._close_files()
+        # Binary: lines arrive encoded, and "\n" isn't rewritten to "\r\n"
+        self._ndjson_f = open(ndjson_path, mode="ab")
+        self._csv_f = open(csv_path, mode="a", newline="", encoding="utf-8")
+        self._csv_writer = csv.writer(self._csv_f)
+        if self._csv_f.tell() == 0:
+            self._csv_writer.writerow(_CSV_HEADER)
+        self._day = day
+
+    def _close_files(self) -> None:
+        for f in (self._ndjson_f, self._csv_f):
+            if f is not None:
+                try:
+                    f.close()
+                except Exception:
+                    pass
+        self._ndjson_f = self._csv_f = self._csv_writer = None
+        self._day = None
+
+    def _ensure_writer(self) -> None:
+        with self._writer_lock:
+            if self._writer_thread is None or not self._writer_thread.is_alive():
+                self._writer_thread = Thread(target=self._writer_loop, daemon=True)
+                self._writer_thread.start()
+                # The thread is a daemon; make sure queued records land on
+                # exit. Once per logger, not once per writer restart.
+                if not self._atexit_registered:
+                    atexit.register(self.close)
+                    self._atexit_registered = True
+
+    def _writer_loop(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            # Take whatever else is already waiting so a burst is one flush
+            while len(batch) < self._flush_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            records = []
+            for item in batch:
+                if item is _LOG_STOP:
+                    stopping = True
+                elif type(item) is list:
+                    # From log_clicks()
+                    records.extend(item)
+                else:
+                    records.append(item)
             try:
-                with self._ndjson_lock:
-                    with open(self.ndjson_path, mode="a", encoding="utf-8") as nf:
-                        nf.write(json.dumps(record, ensure_ascii=False) + "\n")
-                logger.debug(f"Wrote to NDJSON: {self.ndjson_path}")
-            except Exception as e:
-                logger.error(f"Failed to write NDJSON: {e}", exc_info=True)
+                if records:
+                    self._write_batch(records)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        self._close_files()
+
+    def _write_batch(self, records: list[Dict[str, Any]]) -> None:
+        try:
+            self._open_files()
+        except Exception as e:
+            logger.error(f"Failed to open click logs: {e}", exc_info=True)
+            self._close_files()
+            # The day folder may have been removed; recreate it next time
+            self._day_cache = None
+            return
 
-            # CSV
+        # NDJSON: encode per record so one unserializable record doesn't
+        # cost the rest of the batch
+        lines = []
+        for record in records:
             try:
-                with self._csv_lock:
-                    self._ensure_csv_header()
-                    with open(self.csv_path, mode="a", newline="", encoding="utf-8") as cf:
-                        writer = csv.writer(cf)
-                        writer.writerow([
-                            record.get("timestamp_utc"),
-                            record.get("x"),
-                            record.get("y"),
-                            record.get("app_name"),
-                            record.get("process_id"),
-                            record.get("window_title"),
-                            record.get("display_id"),
-                            record.get("source"),
-                            record.get("url_or_path"),
-                            record.get("doc_path"),
-                            (record.get("text") or "").replace("\n", " ").strip(),
-                            record.get("screenshot_path"),
-                        ])
-                logger.debug(f"Wrote to CSV: {self.csv_path}")
+                lines.append(_ndjson_line(record))
             except Exception as e:
-                logger.error(f"Failed to write CSV: {e}", exc_info=True)
+                logger.error(f"Skipping record that can't be serialized to NDJSON: {e}", exc_info=True)
+        try:
+            self._ndjson_f.write(b"".join(lines))
+            self._ndjson_f.flush()
+            logger.debug("Wrote %d record(s) to NDJSON: %s", len(lines), self._day_cache[2])
+        except Exception as e:
+            logger.error(f"Failed to write NDJSON: {e}", exc_info=True)
+
+        # CSV
+        try:
+            # The writer is created once per open file, not per record
+            self._csv_writer.writerows(_csv_row(record) for record in records)
+            self._csv_f.flush()
+            logger.debug("Wrote %d record(s) to CSV: %s", len(records), self._day_cache[1])
+        except Exception as e:
+            logger.error(f"Failed to write CSV: {e}", exc_info=True)
+
+    def flush(self) -> None:
+        """Block until every record logged so far has been written."""
+        if self._writer_thread is not None and self._writer_thread.is_alive():
+            self._queue.join()
+
+    def close(self) -> None:
+        """Write any pending records, stop the writer and close both files."""
+        # Held across the join so log_click can't start a second writer on
+        # the same queue and files while this one is still draining
+        with self._writer_lock:
+            thread = self._writer_thread
+            if thread is not None and thread.is_alive():
+                self._queue.put(_LOG_STOP)
+                thread.join(timeout=5.0)
+                if thread.is_alive():
+                    # Keep the handle so _ensure_writer reuses it; the marker
+                    # is queued, so it still exits once it catches up
+                    logger.warning("Click log writer did not finish within 5s of close()")
+                    return
+            self._writer_thread = None
+            if self._atexit_registered:
+                atexit.unregister(self.close)
+                self._atexit_registered = False
+
+    @staticmethod
+    def _normalize(record: Dict[str, Any]) -> None:
+        # Normalize minimal fields in place; callers hand the record over
+        if "timestamp_utc" not in record:
+            record["timestamp_utc"] = utc_iso_millis()
+        for key, default in _KNOWN_DEFAULTS:
+            record.setdefault(key, default)
+
+        # %-style so nothing is formatted unless INFO is enabled; %.50s
+        # truncates the text without slicing it here
+        logger.info(
+            "Logging click: source=%s, x=%s, y=%s, text=%.50s",
+            record["source"], record["x"], record["y"], record["text"],
+        )
+
+    def log_click(self, record: Dict[str, Any]) -> None:
+        try:
+            self._normalize(record)
+            self._ensure_writer()
+            self._queue.put(record)
         except Exception as e:
             logger.error(f"Error in log_click: {e}", exc_info=True)
 
+    def log_clicks(self, records: list[Dict[str, Any]]) -> None:
+        """Log several records as one queue item, written in the same batch."""
+        try:
+            for record in records:
+                self._normalize(record)
+            if records:
+                self._ensure_writer()
+                self._queue.put(list(records))
+        except Exception as e:
+            logger.error(f"Error in log_clicks: {e}", exc_info=True)
+
+
+_LOGGERS: Dict[str, ClickLogger] = {}
+_LOGGERS_LOCK = Lock()
+
+
+def get_logger(output_base: str) -> ClickLogger:
+    """Return the process-wide ClickLogger for ``output_base``.
+
+    Two loggers on one folder would each hold the day's files open and
+    interleave writes, so scripts and the native host share one per base.
+    """
+    key = os.path.abspath(output_base)
+    with _LOGGERS_LOCK:
+        inst = _LOGGERS.get(key)
+        if inst is None:
+            inst = _LOGGERS[key] = ClickLogger(key)
+        return inst
+
+
+def last_line(path: str, block: int = 8192) -> str:
+    """Return the last non-empty line of ``path``, reading only its tail.
 
+    Reads backwards ``block`` bytes at a time until the chunk holds a full
+    line, so a long last record still costs reads proportional to its size.
+    """
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        tail = b""
+        while pos > 0:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+            # A newline before the last line's content means it's complete
+            if b"\n" in tail.rstrip():
+                break
+    lines = tail.splitlines()
+    while lines and not lines[-1].strip():
+        lines.pop()
+    return lines[-1].decode("utf-8", "replace").strip() if lines else "<no lines>"
@@ -1,21 +1,28 @@
 from __future__ import annotations
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict
+from functools import lru_cache
 from typing import Optional
 
 from fastapi import FastAPI, Body
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel, ConfigDict
 
 from capture import ScreenCapture, CaptureConfig
 from listener import GlobalClickListener, ListenerConfig
 from listener import find_pid_for_window_title
 from logger import ClickLogger
+import asyncio
+import heapq
+import itertools
 import threading
 import time
 import uuid
 from typing import Dict
-import mss
+from urllib.parse import urlparse, unquote
+from monitors import get_monitor_rects
 import logging
 LOG_PATH = os.path.join(os.path.dirname(__file__), 'backend_ext.log')
 logging.basicConfig(filename=LOG_PATH, level=logging.INFO, format='%(asctime)s [backend] %(levelname)s: %(message)s')
@@ -31,6 +38,28 @@ except Exception:
     OUTPUT_BASE = os.path.join(os.path.dirname(__file__), "..", "data")
 
 
+_IS_WIN = os.name == "nt"
+
+# Cell size (px) of the spatial index over pending clicks; equal to the
+# ext_event merge distance so a merge lookup touches at most 3x3 cells.
+_GRID_CELL = 80
+
+
+def _grid_cell(x: float, y: float) -> tuple[int, int]:
+    return int(x // _GRID_CELL), int(y // _GRID_CELL)
+
+
+class _PendingEntry:
+    """An OS click held back for a possible extension merge."""
+
+    # created_at is time.monotonic(); it is only compared, never persisted
+    __slots__ = ("record", "created_at")
+
+    def __init__(self, record: dict, created_at: float) -> None:
+        self.record = record
+        self.created_at = created_at
+
+
 class AppState:
     def __init__(self) -> None:
         self.config = CaptureConfig(hz=1.0, output_base=os.path.abspath(OUTPUT_BASE))
@@ -47,9 +76,25 @@ class AppState:
         self.listener = GlobalClickListener(ListenerConfig(on_click=self._on_click))
 
         # Pending clicks waiting for extension payloads.
-        # Map: click_id -> {record, timer, created_at}
-        self._pending: Dict[str, dict] = {}
+        # Map: click_id -> _PendingEntry
+        self._pending: Dict[int, _PendingEntry] = {}
         self._pending_lock = threading.Lock()
+        self._click_ids = itertools.count()
+        self._session_id = uuid.uuid4().hex[:8]
+        # Spatial index over _pending: grid cell -> click ids in that cell.
+        # Guarded by _pending_lock; kept in step via _pop_pending().
+        self._grid: Dict[tuple[int, int], set[int]] = {}
+        # Flush deadlines as a min-heap of (monotonic deadline, click_id),
+        # served by one scheduler thread instead of a Timer thread per click.
+        # Ids merged or flushed early are simply gone from _pending by then.
+        self._sched_heap: list[tuple[float, int]] = []
+        self._sched_cv = threading.Condition()
+        self._sched_thread = threading.Thread(target=self._scheduler_loop, daemon=True)
+        self._sched_thread.start()
+        # ext_event's blocking steps (grab, monitor mapping, process scan) run
+        # here rather than in anyio's pool shared with the sync endpoints, so
+        # a slow /start or /config can't queue extension clicks behind it.
+        self._io_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ext-io")
         # Matching parameters
         self._merge_timeout = 0.250  # seconds
         self._merge_distance_px = 80  # pixels tolerance when matching ext payload to click
@@ -63,46 +108,33 @@ class AppState:
             self._screenshot_attach_timeout = 1.5
         self._screenshot_attach_distance = 120
 
+    async def _run_io(self, fn, *args):
+        """Run a blocking call on the ext_event executor and await its result."""
+        return await asyncio.get_running_loop().run_in_executor(self._io_executor, fn, *args)
+
     def _on_screenshot(self, path: str, cursor_x: int, cursor_y: int, monitor_index: int) -> None:
         """Called by ScreenCapture when a screenshot is saved.
 
         Try to find a pending click close in time and distance and attach the
         screenshot path, then flush that pending record immediately.
         """
+        # Unlocked emptiness check: a stale answer only means one extra
+        # locked lookup, or a click added right now waits for the next frame
+        if not self._pending:
+            return
         try:
-            now = time.time()
-            candidate = None
-            candidate_dist = None
-            candidate_id = None
+            now = time.monotonic()
             with self._pending_lock:
-                for cid, entry in list(self._pending.items()):
-                    rec = entry.get("record", {})
-                    rx = rec.get("x")
-                    ry = rec.get("y")
-                    if rx is None or ry is None:
-                        continue
-                    # Only consider recent pending entries
-                    if now - entry.get("created_at", 0) > self._screenshot_attach_timeout:
-                        continue
-                    dist = ((rx - cursor_x) ** 2 + (ry - cursor_y) ** 2) ** 0.5
-                    if dist <= self._screenshot_attach_distance and (candidate is None or dist < candidate_dist):
-                        candidate = entry
-                        candidate_dist = dist
-                        candidate_id = cid
-                if candidate_id:
-                    entry = self._pending.pop(candidate_id, None)
-                else:
-                    entry = None
+                candidate_id = self._nearest_pending(
+                    cursor_x, cursor_y, self._screenshot_attach_distance, self._screenshot_attach_timeout, now
+                )
+                entry = self._pop_pending(candidate_id) if candidate_id is not None else None
 
             if not entry:
                 return
 
-            # Cancel the flush timer and attach screenshot
-            try:
-                entry["timer"].cancel()
-            except Exception:
-                pass
-            rec = entry.get("record", {})
+            # Attach screenshot; the scheduled flush finds the id gone
+            rec = entry.record
             rec["screenshot_path"] = path
             try:
                 self.logger.log_click(rec)
@@ -116,33 +148,129 @@ class AppState:
         # a Chrome extension payload to arrive and augment the record.
         record.setdefault("screenshot_path", None)
         record.setdefault("source", "os")
-        record_id = str(uuid.uuid4())
-        record.setdefault("_id", record_id)
+        # Pending keys only need to be unique within this process; the logged
+        # _id adds a per-session prefix so ids stay unique across restarts.
+        record_id = next(self._click_ids)
+        record.setdefault("_id", f"{self._session_id}-{record_id}")
 
-        def _flush():
-            with self._pending_lock:
-                entry = self._pending.pop(record_id, None)
+        with self._pending_lock:
+            self._pending[record_id] = _PendingEntry(record, time.monotonic())
+            # Clicks without coordinates can never be matched, so aren't indexed
+            if record.get("x") is not None and record.get("y") is not None:
+                self._grid.setdefault(_grid_cell(record["x"], record["y"]), set()).add(record_id)
+        with self._sched_cv:
+            heapq.heappush(self._sched_heap, (time.monotonic() + self._merge_timeout, record_id))
+            # The scheduler only needs waking if this is now the earliest
+            # deadline; with a fixed timeout that's only when the heap was empty.
+            if self._sched_heap[0][1] == record_id:
+                self._sched_cv.notify()
+
+    def _nearest_pending(
+        self, x: float, y: float, max_dist: float, max_age: float, now: float
+    ) -> Optional[int]:
+        """Return the id of the closest pending click within max_dist px that is
+        at most max_age seconds old, or None. Caller holds _pending_lock.
+
+        Only the grid cells that can hold a click within max_dist are visited.
+        """
+        reach = -(-int(max_dist) // _GRID_CELL)  # ceil
+        cx, cy = _grid_cell(x, y)
+        limit_sq = max_dist * max_dist
+        best = None
+        best_dist_sq = None
+        for gx in range(cx - reach, cx + reach + 1):
+            for gy in range(cy - reach, cy + reach + 1):
+                ids = self._grid.get((gx, gy))
+                if not ids:
+                    continue
+                for cid in ids:
+                    entry = self._pending[cid]
+                    if now - entry.created_at > max_age:
+                        continue
+                    rec = entry.record
+                    dx = rec["x"] - x
+                    dy = rec["y"] - y
+                    # Squared distances order the same as distances; no sqrt
+                    dist_sq = dx * dx + dy * dy
+                    if dist_sq <= limit_sq and (best is None or dist_sq < best_dist_sq):
+                        best = cid
+                        best_dist_sq = dist_sq
+        return best
+
+    def _pop_pending(self, record_id: int) -> Optional[_PendingEntry]:
+        """Remove a pending click and its grid entry. Caller holds _pending_lock."""
+        entry = self._pending.pop(record_id, None)
+        if entry is not None:
+            rec = entry.record
+            if rec.get("x") is not None and rec.get("y") is not None:
+                cell = _grid_cell(rec["x"], rec["y"])
+                ids = self._grid.get(cell)
+                if ids is not None:
+                    ids.discard(record_id)
+                    if not ids:
+                        del self._grid[cell]
+        return entry
+
+    def _scheduler_loop(self) -> None:
+        while True:
+            with self._sched_cv:
+                while True:
+                    if not self._sched_heap:
+                        self._sched_cv.wait()
+                        continue
+                    delay = self._sched_heap[0][0] - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._sched_cv.wait(delay)
+                now = time.monotonic()
+                due = []
+                while self._sched_heap and self._sched_heap[0][0] <= now:
+                    due.append(heapq.heappop(self._sched_heap)[1])
+            self._flush_pending(due)
+
+    def _flush_pending(self, record_ids: list[int]) -> None:
+        """Log pending clicks whose merge window expired without a match.
+
+        All ids come off _pending under one lock acquisition; logging happens
+        after it is released.
+        """
+        with self._pending_lock:
+            entries = [self._pop_pending(record_id) for record_id in record_ids]
+        for entry in entries:
             if not entry:
-                return
+                continue
             try:
-                self.logger.log_click(entry["record"])
+                self.logger.log_click(entry.record)
             except Exception:
-                # Avoid crashing the listener thread
-                pass
-
-        t = threading.Timer(self._merge_timeout, _flush)
-        with self._pending_lock:
-            self._pending[record_id] = {"record": record, "timer": t, "created_at": time.time()}
-        t.daemon = True
-        t.start()
+                # Avoid killing the scheduler thread
+                logger.exception("Failed to flush pending click")
 
 
 state = AppState()
 
-app = FastAPI(title="Desktop Capture Backend", version="0.1.0")
+# orjson serializes responses in C; fall back to the stdlib encoder without it
+try:
+    import orjson  # noqa: F401  (required by ORJSONResponse)
+    from fastapi.responses import ORJSONResponse as _DefaultResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as _DefaultResponse
+
+app = FastAPI(title="Desktop Capture Backend", version="0.1.0", default_response_class=_DefaultResponse)
+# Browser clients are the extension and pages served by the backend itself;
+# other sites get no CORS headers. A comma-separated
+# DESKTOP_CAPTURE_CORS_ORIGINS (or "*") replaces these defaults, e.g. for an
+# unpacked extension whose id differs from the packaged one.
+_DEFAULT_CORS_ORIGINS = [
+    "chrome-extension://klhohdnggilcollbfiohahnndcmehbpl",
+    "http://localhost:8000",
+    "http://127.0.0.1:8000",
+]
+_CORS_ORIGINS = [
+    o.strip() for o in os.environ.get("DESKTOP_CAPTURE_CORS_ORIGINS", "").split(",") if o.strip()
+] or _DEFAULT_CORS_ORIGINS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=_CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -150,33 +278,28 @@ app.add_middleware(
 )
 
 # Add Private Network Access (PNA) headers for Chrome extension
-from starlette.responses import Response
 from starlette.requests import Request
 
 @app.middleware("http")
 async def add_pna_headers(request: Request, call_next):
-    # Handle preflight OPTIONS requests for Private Network Access
-    if request.method == "OPTIONS":
-        response = Response(status_code=200)
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        response.headers["Access-Control-Allow-Methods"] = "*"
-        response.headers["Access-Control-Allow-Headers"] = "*"
-        response.headers["Access-Control-Allow-Private-Network"] = "true"
-        return response
-    
+    # CORSMiddleware answers preflights and applies the allowlist; this only
+    # adds the PNA opt-in to responses it actually granted an origin.
     response = await call_next(request)
-    # Allow requests from public websites to localhost
-    response.headers["Access-Control-Allow-Private-Network"] = "true"
+    if "access-control-allow-origin" in response.headers:
+        response.headers["Access-Control-Allow-Private-Network"] = "true"
     return response
 
 
+# Handlers that only read or flip in-memory state are async so they run on the
+# event loop. The ones that start/stop threads, close the logger or touch the
+# disk stay plain def and run in FastAPI's thread pool.
 @app.get("/health")
-def health() -> dict:
+async def health() -> dict:
     return {"status": "ok"}
 
 
 @app.get("/status")
-def status() -> dict:
+async def status() -> dict:
     return {
         "capture_running": state.capture.is_running(),
         "listener_running": state.listener.is_running(),
@@ -186,7 +309,7 @@ def status() -> dict:
     }
 
 @app.post("/electron_status")
-def electron_status(active: bool = Body(..., embed=True)) -> dict:
+async def electron_status(active: bool = Body(..., embed=True)) -> dict:
     state.electron_active = active
     state.electron_last_seen = time.time()
     return {"ok": True}
@@ -215,12 +338,22 @@ def set_config(
         state.config.hz = hz
     if output_base is not None:
         state.config.output_base = os.path.abspath(output_base)
-        # Update logger with new output base
+        # Update logger with new output base; the old one drains and closes its files
+        old_logger = state.logger
         state.logger = ClickLogger(state.config.output_base)
+        old_logger.close()
         logger.info(f"Updated output_base to: {state.config.output_base}")
     return {"hz": state.config.hz, "output_base": state.config.output_base}
 
 
+@app.post("/refresh_monitors")
+def refresh_monitors() -> dict:
+    """Re-enumerate monitors after a display layout change."""
+    rects = get_monitor_rects(refresh=True)
+    state.capture.refresh_monitors()
+    return {"monitors": len(rects)}
+
+
 @app.post("/start_listener")
 def start_listener() -> dict:
     """Start only the OS click listener (debug endpoint). Returns any exception text on failure."""
@@ -244,7 +377,7 @@ def stop_listener() -> dict:
 
 
 @app.get("/listener_status")
-def listener_status() -> dict:
+async def listener_status() -> dict:
     """Return a simple diagnostic about the listener object."""
     try:
         listener_obj = getattr(state.listener, '_listener', None)
@@ -259,104 +392,188 @@ def listener_status() -> dict:
         logger.exception("listener_status error")
         return {"error": str(e)}
 
+# (output_base, folder, epoch of the next local midnight) of the last
+# /recent_screenshots call, so polling clients don't redo strftime + join
+# until the day rolls over
+_today_cache: tuple[str, str, float] = ("", "", 0.0)
+
+
+def _day_folder(output_base: str, now: float) -> str:
+    """Today's (local day) folder under output_base, rebuilt once per day."""
+    global _today_cache
+    base, folder, expires = _today_cache
+    if base != output_base or now >= expires:
+        lt = time.localtime(now)
+        folder = os.path.join(output_base, time.strftime("%Y-%m-%d", lt))
+        # mktime normalizes the day overflow and resolves DST itself
+        expires = time.mktime((lt.tm_year, lt.tm_mon, lt.tm_mday + 1, 0, 0, 0, 0, 0, -1))
+        _today_cache = (output_base, folder, expires)
+    return folder
+
+
 @app.get("/recent_screenshots")
 def recent_screenshots(seconds: float = 1.0) -> dict:
     """Return paths of screenshots taken in the last N seconds."""
-    import glob
-    import time
-    import os
-    
     now = time.time()
-    folder = os.path.join(state.config.output_base, time.strftime("%Y-%m-%d"))
-    if not os.path.exists(folder):
-        return {"screenshots": []}
-        
+    cutoff = now - seconds
+    folder = _day_folder(state.config.output_base, now)
     screenshots = []
     try:
-        for png in glob.glob(os.path.join(folder, "*.png")):
-            try:
-                mtime = os.path.getmtime(png)
-                if now - mtime <= seconds:
-                    screenshots.append(png)
-            except Exception:
-                continue
+        # One directory pass; DirEntry.stat() is served from the directory
+        # listing on Windows and costs one stat elsewhere (glob + getmtime
+        # stat'ed every match twice)
+        with os.scandir(folder) as it:
+            for entry in it:
+                if not entry.name.endswith((".jpg", ".png")):
+                    continue
+                try:
+                    if entry.stat().st_mtime >= cutoff:
+                        screenshots.append(entry.path)
+                except OSError:
+                    continue
+    except FileNotFoundError:
+        return {"screenshots": []}
     except Exception as e:
         logger.exception(f"Error listing screenshots: {e}")
-    return {"screenshots": sorted(screenshots)}
+    screenshots.sort()
+    return {"screenshots": screenshots}
+
+
+# Bursts of extension events usually carry the same title; the time bucket in
+# the cache key makes entries expire after at most _FIND_PID_TTL seconds.
+_FIND_PID_TTL = 2.0
+
+
+@lru_cache(maxsize=256)
+def _find_pid_cached(title: str, bucket: int) -> tuple[Optional[str], Optional[int]]:
+    return find_pid_for_window_title(title)
+
+
+@lru_cache(maxsize=1024)
+def _file_url_to_path(url: str) -> Optional[str]:
+    """Local path for a file:// URL (Chrome's PDF viewer), or None if unparseable.
+
+    Repeated clicks in the same document send the same URL, so the result is cached.
+    """
+    try:
+        path = unquote(urlparse(url).path or "")
+    except ValueError:
+        return None
+    # file:///C:/x.pdf parses to /C:/x.pdf on Windows
+    if _IS_WIN and path.startswith("/") and len(path) > 2 and path[2] == ":":
+        path = path.lstrip("/")
+    return path
+
+
+def _map_global_coords(gx: float, gy: float, dpr: float) -> tuple[Optional[int], tuple]:
+    """Return (display_id, coords) for finite global coords, or (None, (gx, gy)).
+
+    Blocking (may re-enumerate monitors through mss), so ext_event runs it in the
+    I/O executor.
+    """
+    try:
+        rects = get_monitor_rects()
+    except Exception:
+        logger.exception("mss mapping failed in backend ext_event")
+        return None, (gx, gy)
+    # %-style: formatted only if INFO is enabled
+    logger.info("ext_event mapping gx=%s, gy=%s, dpr=%s", gx, gy, dpr)
+    logger.info("Monitors (left, top, right, bottom): %s", rects)
+
+    # Raw coords first, then scaled up (extension sent CSS pixels),
+    # then scaled down; the first candidate on any monitor wins.
+    candidates = [(gx, gy)]
+    if dpr != 1:
+        # Finite inputs can still overflow once scaled (1e308 * 2); such a
+        # candidate can't be on any monitor, so it is just left out.
+        try:
+            candidates.append((round(gx * dpr), round(gy * dpr)))
+        except (OverflowError, ValueError):
+            pass
+        try:
+            candidates.append((round(gx / dpr), round(gy / dpr)))
+        except (OverflowError, ValueError):
+            pass
+
+    for cx, cy in candidates:
+        for idx, (left, top, right, bottom) in enumerate(rects, 1):
+            if left <= cx < right and top <= cy < bottom:
+                logger.info("Mapped display_id=%s using coords=%s", idx, (cx, cy))
+                return idx, (cx, cy)
+    logger.info("No monitor matched incoming global coords (raw or scaled)")
+    return None, (gx, gy)
+
+
+class ExtEventPayload(BaseModel):
+    """Click payload posted by the extension; unknown fields are ignored."""
+
+    # inf/nan coordinates are rejected with a 422 instead of reaching int()
+    model_config = ConfigDict(allow_inf_nan=False)
+
+    text: Optional[str] = None
+    url: Optional[str] = None
+    title: Optional[str] = None
+    # int | float keeps integral coordinates as ints in the logged record
+    x: Optional[int | float] = None
+    y: Optional[int | float] = None
+    global_x: Optional[int | float] = None
+    global_y: Optional[int | float] = None
+    devicePixelRatio: Optional[float] = None
+    dpr: Optional[float] = None
+    display_id: Optional[int] = None
 
 
 @app.post("/ext_event")
-def ext_event(payload: dict = Body(...)) -> dict:
+async def ext_event(payload: ExtEventPayload) -> dict:
+    # Runs on the event loop; the blocking steps (grab, monitor mapping,
+    # process scan) are pushed to state's I/O executor so bursts don't queue
+    # behind one another. The merge path only touches in-memory state.
+
     # Capture screenshot immediately when click event arrives
     screenshot_path = None
     try:
         if state.capture and state.capture.is_running():
-            screenshot_path = state.capture.capture_once()
+            screenshot_path = await state._run_io(state.capture.capture_once)
             if screenshot_path:
-                logger.info(f"Captured on-demand screenshot: {screenshot_path}")
+                logger.info("Captured on-demand screenshot: %s", screenshot_path)
         else:
             logger.warning("Screenshot capture not running - start with POST /start")
     except Exception as e:
-        logger.warning(f"Failed to capture on-demand screenshot: {e}")
+        logger.warning("Failed to capture on-demand screenshot: %s", e)
     
     # Payload expected from extension: {text, url, tabId?, profile?, x?, y?}
-    now = time.time()
-    px = payload.get("x")
-    py = payload.get("y")
+    now = time.monotonic()
+    px = payload.x
+    py = payload.y
 
     # Try to find a pending OS click to merge with (within distance and time window)
     matched_id = None
     matched_entry = None
-    if px is not None and py is not None:
+    if px is not None and py is not None and state._pending:
         with state._pending_lock:
-            best = None
-            best_dist = None
-            for cid, entry in list(state._pending.items()):
-                rec = entry.get("record", {})
-                rx = rec.get("x")
-                ry = rec.get("y")
-                if rx is None or ry is None:
-                    continue
-                # Time filter: only consider recent pending entries
-                if now - entry.get("created_at", 0) > state._merge_timeout:
-                    continue
-                dist = ((px - rx) ** 2 + (py - ry) ** 2) ** 0.5
-                if dist <= state._merge_distance_px and (best is None or dist < best_dist):
-                    best = cid
-                    best_dist = dist
-            if best:
+            best = state._nearest_pending(px, py, state._merge_distance_px, state._merge_timeout, now)
+            if best is not None:
                 matched_id = best
-                matched_entry = state._pending.pop(best, None)
+                matched_entry = state._pop_pending(best)
     if matched_entry:
         try:
-            # Cancel the flush timer since we're handling it now
-            try:
-                matched_entry["timer"].cancel()
-            except Exception:
-                pass
-            rec = matched_entry.get("record", {})
+            # Popped from _pending, so its scheduled flush is now a no-op
+            rec = matched_entry.record
             # Merge extension payload fields
-            rec["text"] = payload.get("text") or rec.get("text")
+            rec["text"] = payload.text or rec.get("text")
             # Attach on-demand screenshot
             if screenshot_path:
                 rec["screenshot_path"] = screenshot_path
             # Handle file:// URLs specially (PDFs)
-            url_val = payload.get("url")
-            if isinstance(url_val, str) and url_val.startswith("file://"):
-                try:
-                    from urllib.parse import urlparse, unquote
-                    parsed = urlparse(url_val)
-                    path = unquote(parsed.path or "")
-                    if os.name == "nt" and path.startswith("/") and len(path) > 2 and path[2] == ":":
-                        path = path.lstrip("/")
-                    rec["doc_path"] = path
-                    rec["url_or_path"] = path
-                except Exception:
-                    rec["url_or_path"] = url_val or rec.get("url_or_path")
+            url_val = payload.url
+            path = _file_url_to_path(url_val) if url_val and url_val.startswith("file://") else None
+            if path is not None:
+                rec["doc_path"] = path
+                rec["url_or_path"] = path
             else:
                 rec["url_or_path"] = url_val or rec.get("url_or_path")
-            rec["window_title"] = payload.get("title") or rec.get("window_title")
-            rec["display_id"] = payload.get("display_id") or rec.get("display_id")
+            rec["window_title"] = payload.title or rec.get("window_title")
+            rec["display_id"] = payload.display_id or rec.get("display_id")
             rec["source"] = "ext"
             state.logger.log_click(rec)
             return {"ok": True, "merged": True, "screenshot_path": screenshot_path}
@@ -366,119 +583,52 @@ def ext_event(payload: dict = Body(...)) -> dict:
     # No matching OS click — write ext-only record. If extension provided global coords,
     # use them to compute display_id and store global x/y. Also handle file:// URLs
     # (Chrome PDF viewer) by extracting a local doc_path.
-    url_val = payload.get("url")
+    url_val = payload.url
     record = {
         "source": "ext",
-        "text": payload.get("text"),
+        "text": payload.text,
         "url_or_path": url_val,
-        "x": payload.get("x"),
-        "y": payload.get("y"),
+        "x": payload.x,
+        "y": payload.y,
         "app_name": "chrome",
         "process_id": None,
-        "window_title": payload.get("title"),
-        "display_id": payload.get("display_id"),
+        "window_title": payload.title,
+        "display_id": payload.display_id,
         "screenshot_path": screenshot_path,
     }
 
     # Treat file:// URLs as document paths (PDFs). Normalize and store as doc_path
-    try:
-        if isinstance(url_val, str) and url_val.startswith("file://"):
-            from urllib.parse import urlparse, unquote
-            parsed = urlparse(url_val)
-            path = unquote(parsed.path or "")
-            if os.name == "nt" and path.startswith("/") and len(path) > 2 and path[2] == ":":
-                path = path.lstrip("/")
+    if url_val and url_val.startswith("file://"):
+        path = _file_url_to_path(url_val)
+        if path is not None:
             record["doc_path"] = path
             record["url_or_path"] = path
             # keep app_name as chrome (embedded PDF viewer) for now
-    except Exception:
-        pass
 
-    gx = payload.get("global_x")
-    gy = payload.get("global_y")
-    dpr = payload.get("devicePixelRatio") or payload.get("dpr") or 1
-    try:
-        if gx is not None and gy is not None:
-            try:
-                with mss.mss() as sct:
-                    monitors = sct.monitors
-                    try:
-                        logger.info(f"ext_event mapping gx={gx}, gy={gy}, dpr={dpr}")
-                        logger.info(f"Monitors: {[{k:mon[k] for k in ('left','top','width','height')} for mon in monitors]}")
-                    except Exception:
-                        pass
-
-                    def try_map(px, py):
-                        for idx in range(1, len(monitors)):
-                            mon = monitors[idx]
-                            if mon["left"] <= px < mon["left"] + mon["width"] and mon["top"] <= py < mon["top"] + mon["height"]:
-                                return idx
-                        return None
-
-                    mapped = None
-                    used_coords = (gx, gy)
-
-                    # raw
-                    mapped = try_map(gx, gy)
-
-                    # scaled up (assume extension sent CSS pixels)
-                    if mapped is None and dpr and dpr != 1:
-                        try:
-                            sgx = int(round(float(gx) * float(dpr)))
-                            sgy = int(round(float(gy) * float(dpr)))
-                            mapped = try_map(sgx, sgy)
-                            if mapped is not None:
-                                used_coords = (sgx, sgy)
-                        except Exception:
-                            pass
-
-                    # scaled down
-                    if mapped is None and dpr and dpr != 1:
-                        try:
-                            dgx = int(round(float(gx) / float(dpr)))
-                            dgy = int(round(float(gy) / float(dpr)))
-                            mapped = try_map(dgx, dgy)
-                            if mapped is not None:
-                                used_coords = (dgx, dgy)
-                        except Exception:
-                            pass
-
-                    if mapped is not None:
-                        record["display_id"] = mapped
-                        try:
-                            record["x"] = int(used_coords[0])
-                            record["y"] = int(used_coords[1])
-                        except Exception:
-                            pass
-                        try:
-                            logger.info(f"Mapped display_id={mapped} using coords={used_coords}")
-                        except Exception:
-                            pass
-                    else:
-                        try:
-                            logger.info("No monitor matched incoming global coords (raw or scaled)")
-                        except Exception:
-                            pass
-            except Exception:
-                logger.exception("mss mapping failed in backend ext_event")
-    except Exception:
-        logger.exception("Error while attempting to map global coords in backend ext_event")
+    gx = payload.global_x
+    gy = payload.global_y
+    dpr = payload.devicePixelRatio or payload.dpr or 1
+    if gx is not None and gy is not None:
+        mapped, used_coords = await state._run_io(_map_global_coords, gx, gy, dpr)
+        if mapped is not None:
+            record["display_id"] = mapped
+            record["x"] = int(used_coords[0])
+            record["y"] = int(used_coords[1])
 
     # Attempt to resolve process_id/app_name for ext-only events by scanning
     # window titles / processes if possible (best-effort).
-    try:
-        if not record.get("process_id"):
-            title = payload.get("title") or payload.get("url")
-            if title:
-                try:
-                    app_name_guess, pid_guess = find_pid_for_window_title(title)
-                    if pid_guess:
-                        record["process_id"] = pid_guess
-                        record["app_name"] = app_name_guess or record.get("app_name")
-                except Exception:
-                    pass
-    except Exception:
-        pass
+    title = payload.title or payload.url
+    if title:
+        try:
+            app_name_guess, pid_guess = await state._run_io(
+                _find_pid_cached, title, int(time.monotonic() // _FIND_PID_TTL)
+            )
+        except Exception:
+            logger.exception("pid lookup failed in backend ext_event")
+        else:
+            if pid_guess:
+                record["process_id"] = pid_guess
+                record["app_name"] = app_name_guess or record.get("app_name")
 
     state.logger.log_click(record)
     return {"ok": True, "merged": False, "screenshot_path": screenshot_path}
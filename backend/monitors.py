@@ -0,0 +1,65 @@
+"""Process-wide cache of the monitor layout.
+
+Opening an mss instance creates GDI/X11/CoreGraphics handles, so the display
+lookups in the listener and the API share one cached enumeration instead of
+constructing a new instance per event. No handle is kept between
+enumerations: mss keeps its Windows DCs per thread, and a shared handle
+closed from whichever thread hit the TTL would leak them. Grabbing frames
+stays on the capture thread's own instances.
+"""
+from __future__ import annotations
+
+import time
+from threading import Lock
+
+import mss
+
+# The layout is re-enumerated at most this often to pick up changes.
+_MONITOR_TTL = 10.0  # seconds
+
+_lock = Lock()
+_monitors: list[dict] = []
+_enumerated: float | None = None
+# (left, top, right, bottom) per physical monitor, rebuilt with _monitors;
+# right/bottom are exclusive
+_rects: list[tuple[int, int, int, int]] = []
+
+
+def _refresh(refresh: bool) -> None:
+    """Re-enumerate monitors if forced or stale. Caller holds _lock."""
+    global _monitors, _enumerated, _rects
+    now = time.monotonic()
+    if not refresh and _enumerated is not None and now - _enumerated < _MONITOR_TTL:
+        return
+    # Opened and closed on this thread, so its handles are released
+    with mss.mss() as sct:
+        monitors = sct.monitors
+    _monitors = monitors
+    _enumerated = now
+    _rects = [
+        (m["left"], m["top"], m["left"] + m["width"], m["top"] + m["height"])
+        for m in monitors[1:]
+    ]
+
+
+def get_monitors(refresh: bool = False) -> list[dict]:
+    """Return mss's monitor list; index 0 is the virtual screen.
+
+    The list is never mutated after it is returned, so callers may keep it
+    until they next call this function. ``refresh`` forces re-enumeration.
+    """
+    with _lock:
+        _refresh(refresh)
+        return _monitors
+
+
+def get_monitor_rects(refresh: bool = False) -> list[tuple[int, int, int, int]]:
+    """Return (left, top, right, bottom) per physical monitor.
+
+    Entry ``i`` is display ``i + 1``; right and bottom are exclusive. Plain
+    tuples, built once per enumeration, so a hit-test is four comparisons
+    per monitor with no dict lookups or additions.
+    """
+    with _lock:
+        _refresh(refresh)
+        return _rects
@@ -5,12 +5,32 @@ import logging
 import os
 import struct
 import sys
+import time
+from functools import lru_cache
 from urllib.parse import urlparse, unquote
-from logger import ClickLogger
+from logger import get_logger
+from monitors import get_monitor_rects
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# orjson parses and emits bytes directly, which is what the framing protocol
+# carries; the stdlib fallback does the same via json.loads(bytes) + encode.
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
 
 
 OUTPUT_BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
-_CLICK_LOGGER = ClickLogger(OUTPUT_BASE)
+_CLICK_LOGGER = get_logger(OUTPUT_BASE)
 
 # Configure a small file logger for the native host process. We avoid printing to stdout
 # because stdout is used for the native messaging framing protocol.
@@ -27,32 +47,46 @@ def ensure_log_dir() -> None:
     os.makedirs(OUTPUT_BASE, exist_ok=True)
 
 
+# Framed input is read from fd 0 in large chunks instead of two buffered reads
+# per message; bytes past the current frame stay here for the next call.
+_IN_BUF = bytearray()
+_READ_CHUNK = 65536
+# Native messaging length prefix: 32-bit unsigned, native byte order
+_HDR = struct.Struct("I")
+
+
+def _fill(n: int) -> bool:
+    """Read stdin until _IN_BUF holds at least n bytes. False on EOF."""
+    while len(_IN_BUF) < n:
+        chunk = os.read(0, max(_READ_CHUNK, n - len(_IN_BUF)))
+        if not chunk:
+            return False
+        _IN_BUF.extend(chunk)
+    return True
+
+
 def read_message():
     try:
         # Read the message length (first 4 bytes)
-        raw_length = sys.stdin.buffer.read(4)
-        if not raw_length:
-            # stdin closed - this is normal when Chrome disconnects
-            return None
-            
-        # Unpack message length as unsigned int
-        try:
-            message_length = struct.unpack("I", raw_length)[0]
-        except struct.error as e:
-            logger.error(f"Failed to unpack message length: {e}")
-            return None
-            
-        # Read the message content
         try:
-            message = sys.stdin.buffer.read(message_length).decode("utf-8")
-        except (IOError, UnicodeDecodeError) as e:
+            if not _fill(4):
+                # stdin closed - this is normal when Chrome disconnects
+                return None
+            message_length = _HDR.unpack_from(_IN_BUF)[0]
+            end = 4 + message_length
+            if not _fill(end):
+                logger.error(f"stdin closed mid-message ({len(_IN_BUF) - 4}/{message_length} bytes)")
+                return None
+        except OSError as e:
             logger.error(f"Failed to read message content: {e}")
             return None
+        message = _IN_BUF[4:end]
+        del _IN_BUF[:end]
             
-        # Parse JSON
+        # Parse JSON (invalid UTF-8 and bad JSON both raise ValueError)
         try:
-            return json.loads(message)
-        except json.JSONDecodeError as e:
+            return _loads(message)
+        except ValueError as e:
             logger.error(f"Failed to parse message JSON: {e}")
             return None
             
@@ -62,80 +96,136 @@ def read_message():
 
 
 def send_message(message):
-    encoded = json.dumps(message).encode("utf-8")
-    sys.stdout.buffer.write(struct.pack("I", len(encoded)))
-    sys.stdout.buffer.write(encoded)
+    encoded = _dumps(message)
+    # One write per frame so the header and body leave in a single flush
+    frame = bytearray(_HDR.size + len(encoded))
+    _HDR.pack_into(frame, 0, len(encoded))
+    frame[_HDR.size:] = encoded
+    sys.stdout.buffer.write(frame)
     sys.stdout.buffer.flush()
 
 
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") of the last _utc_now_iso() call, so
+# only the microseconds are formatted for messages within the same second
+_TS_CACHE: tuple[int, str] = (-1, "")
+
+
+def _utc_now_iso() -> str:
+    """UTC now as ISO 8601 with microseconds and a Z suffix."""
+    global _TS_CACHE
+    ns = time.time_ns()
+    sec = ns // 1_000_000_000
+    cached_sec, prefix = _TS_CACHE
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _TS_CACHE = (sec, prefix)
+    return f"{prefix}.{ns // 1000 % 1_000_000:06d}Z"
+
+
+@lru_cache(maxsize=256)
+def _file_url_to_path(url: str) -> str:
+    """Absolute local path for a file:// URL; the same PDF is clicked repeatedly."""
+    path = unquote(urlparse(url).path or "")
+    # Clean Windows paths
+    if os.name == "nt" and path.startswith("/") and len(path) > 2 and path[2] == ":":
+        path = path.lstrip("/")
+    return os.path.abspath(path)
+
+
+# tabId (or None) -> (pid, monotonic time found). Chrome's processes outlive
+# many clicks, so the process table is only scanned on a miss, when the cached
+# pid has exited, or once an entry is _CHROME_PID_TTL seconds old.
+_CHROME_PIDS: dict = {}
+_CHROME_PID_TTL = 30.0  # seconds
+
+
+def _find_chrome_pid(tab_id):
+    if psutil is None:
+        return None
+    now = time.monotonic()
+    cached = _CHROME_PIDS.get(tab_id)
+    if cached is not None and now - cached[1] < _CHROME_PID_TTL and psutil.pid_exists(cached[0]):
+        return cached[0]
+
+    pid = None
+    for proc in psutil.process_iter(['pid', 'name']):
+        try:
+            if 'chrome' in (proc.info['name'] or '').lower():
+                # If we have a tab ID, try to match it in the command line
+                if tab_id:
+                    cmdline = ' '.join(proc.cmdline()).lower()
+                    if f'tab={tab_id}' in cmdline or str(tab_id) in cmdline:
+                        pid = proc.info['pid']
+                        break
+                else:
+                    # No tab ID - use first Chrome process found
+                    pid = proc.info['pid']
+                    break
+        except Exception:
+            continue
+    if pid is not None:
+        if len(_CHROME_PIDS) >= 256:
+            # One entry per tab seen; drop them all rather than track LRU order
+            _CHROME_PIDS.clear()
+        _CHROME_PIDS[tab_id] = (pid, now)
+    else:
+        _CHROME_PIDS.pop(tab_id, None)
+    return pid
+
+
+# Last monitor list written to the log by write_log
+_LOGGED_RECTS = None
+
+
 def write_log(data):
     ensure_log_dir()
-    ts = datetime.datetime.utcnow().isoformat() + "Z"
-    text = data.get("text")
-    url = data.get("browser_url") or data.get("url")
+    ts = _utc_now_iso()
+    # Every field is read once up front; the rest of the function uses locals
+    get = data.get
+    text = get("text")
+    url = get("browser_url") or get("url")
+    is_pdf = get("is_pdf")
+    pdf_path = get("pdf_path")
     
-    # Log the incoming data for debugging
-    try:
-        logger.info(f"Received data: {json.dumps(data)}")
-    except Exception:
-        logger.warning("Could not log incoming data")
+    # Log the incoming data for debugging; %-style defers formatting to when
+    # DEBUG is actually enabled instead of re-serializing every message
+    logger.debug("Received data: %s", data)
         
     # Try to get process info for Chrome
     process_id = None
     try:
-        import psutil
-        for proc in psutil.process_iter(['pid', 'name']):
-            try:
-                if 'chrome' in proc.info['name'].lower():
-                    # If we have a tab ID, try to match it in the command line
-                    tab_id = data.get('tabId')
-                    if tab_id:
-                        cmdline = ' '.join(proc.cmdline()).lower()
-                        if f'tab={tab_id}' in cmdline or str(tab_id) in cmdline:
-                            process_id = proc.info['pid']
-                            break
-                    else:
-                        # No tab ID - use first Chrome process found
-                        process_id = proc.info['pid']
-                        break
-            except Exception:
-                continue
+        process_id = _find_chrome_pid(get('tabId'))
     except Exception as e:
         logger.warning(f"Failed to get Chrome process info: {e}")
     # Handle PDF paths first
     doc_path = None
-    if data.get("is_pdf"):
+    if is_pdf:
         # Check explicit PDF path from extension
-        if data.get("pdf_path"):
-            doc_path = os.path.abspath(data["pdf_path"])
+        if pdf_path:
+            doc_path = os.path.abspath(pdf_path)
             logger.info(f"Using explicit PDF path: {doc_path}")
         # Try file:// URL parsing
         elif url and isinstance(url, str) and url.startswith("file://"):
             try:
-                parsed = urlparse(url)
-                path = unquote(parsed.path or "")
-                # Clean Windows paths
-                if os.name == "nt" and path.startswith("/") and len(path) > 2 and path[2] == ":":
-                    path = path.lstrip("/")
-                doc_path = os.path.abspath(path)
+                doc_path = _file_url_to_path(url)
                 logger.info(f"Extracted PDF path from URL: {doc_path}")
-            except Exception as e:
+            except ValueError as e:
                 logger.warning(f"Failed to parse PDF URL: {e}")
 
     record = {
         "timestamp_utc": ts,
-        "x": data.get("x"),
-        "y": data.get("y"),
-        "app_name": "chrome_pdf" if data.get("is_pdf") else "chrome",
+        "x": get("x"),
+        "y": get("y"),
+        "app_name": "chrome_pdf" if is_pdf else "chrome",
         "process_id": process_id,  # Use the process_id we found above
-        "window_title": data.get("title"),
+        "window_title": get("title"),
         "display_id": None,  # Will be set below
-        "source": data.get("source", "ext"),
+        "source": get("source", "ext"),
         "url_or_path": doc_path if doc_path else url,
         "doc_path": doc_path,
         "text": text,
         # If the extension or caller provided a screenshot path (or URL), preserve it
-        "screenshot_path": data.get("screenshot_path") if data.get("screenshot_path") else None,
+        "screenshot_path": get("screenshot_path") or None,
     }
     
     # If extension provided global coordinates, try to map to a display id.
@@ -144,72 +234,55 @@ def write_log(data):
     # and (gx / dpr) to handle cases where the extension reported CSS pixels
     # rather than physical pixels.
     try:
-        gx = data.get("global_x")
-        gy = data.get("global_y")
-        dpr = data.get("devicePixelRatio") or data.get("dpr") or 1
+        gx = get("global_x")
+        gy = get("global_y")
+        dpr = get("devicePixelRatio") or get("dpr") or 1
         if gx is not None and gy is not None:
             try:
-                import mss
-                with mss.mss() as sct:
-                    monitors = sct.monitors
-                    # Diagnostic: log monitor rectangles and incoming coords
+                # Cached (left, top, right, bottom) tuples from monitors.py
+                # instead of opening mss for every message
+                global _LOGGED_RECTS
+                rects = get_monitor_rects()
+                # Diagnostic: log monitor rectangles and incoming coords. The
+                # list is rebuilt on every re-enumeration, so compare by value
+                # to log the layout only when it actually changes.
+                logger.debug("Mapping global coords gx=%s, gy=%s, dpr=%s", gx, gy, dpr)
+                if rects != _LOGGED_RECTS:
+                    _LOGGED_RECTS = rects
+                    logger.info("Monitors (left, top, right, bottom): %s", rects)
+
+                # Raw coords first, then scaled up (extension gave CSS
+                # pixels), then scaled down (extension sent physical pixels)
+                candidates = [(gx, gy)]
+                if dpr and dpr != 1:
                     try:
-                        logger.info(f"Mapping global coords gx={gx}, gy={gy}, dpr={dpr}")
-                        logger.info(f"Monitors: {[{k:mon[k] for k in ('left','top','width','height')} for mon in monitors]}")
+                        fx, fy, fdpr = float(gx), float(gy), float(dpr)
+                        candidates.append((int(round(fx * fdpr)), int(round(fy * fdpr))))
+                        candidates.append((int(round(fx / fdpr)), int(round(fy / fdpr))))
                     except Exception:
                         pass
 
-                    def try_map(px, py):
-                        for idx in range(1, len(monitors)):
-                            mon = monitors[idx]
-                            if mon["left"] <= px < mon["left"] + mon["width"] and mon["top"] <= py < mon["top"] + mon["height"]:
-                                return idx
-                        return None
-
-                    mapped = None
-                    used_coords = (gx, gy)
-
-                    # Attempt 1: raw coords
-                    mapped = try_map(gx, gy)
-
-                    # Attempt 2: scale up (assume extension gave CSS pixels)
-                    if mapped is None and dpr and dpr != 1:
-                        try:
-                            sgx = int(round(float(gx) * float(dpr)))
-                            sgy = int(round(float(gy) * float(dpr)))
-                            mapped = try_map(sgx, sgy)
-                            if mapped is not None:
-                                used_coords = (sgx, sgy)
-                        except Exception:
-                            pass
-
-                    # Attempt 3: scale down (extension may have sent physical pixels)
-                    if mapped is None and dpr and dpr != 1:
-                        try:
-                            dgx = int(round(float(gx) / float(dpr)))
-                            dgy = int(round(float(gy) / float(dpr)))
-                            mapped = try_map(dgx, dgy)
-                            if mapped is not None:
-                                used_coords = (dgx, dgy)
-                        except Exception:
-                            pass
-
+                mapped = None
+                used_coords = (gx, gy)
+                for cx, cy in candidates:
+                    for idx, (left, top, right, bottom) in enumerate(rects, 1):
+                        if left <= cx < right and top <= cy < bottom:
+                            mapped = idx
+                            used_coords = (cx, cy)
+                            break
                     if mapped is not None:
-                        record["display_id"] = mapped
-                        try:
-                            record["x"] = int(used_coords[0])
-                            record["y"] = int(used_coords[1])
-                        except Exception:
-                            pass
-                        try:
-                            logger.info(f"Mapped display_id={mapped} using coords={used_coords}")
-                        except Exception:
-                            pass
-                    else:
-                        try:
-                            logger.info("No monitor matched incoming global coords (raw or scaled)")
-                        except Exception:
-                            pass
+                        break
+
+                if mapped is not None:
+                    record["display_id"] = mapped
+                    try:
+                        record["x"] = int(used_coords[0])
+                        record["y"] = int(used_coords[1])
+                    except Exception:
+                        pass
+                    logger.debug("Mapped display_id=%s using coords=%s", mapped, used_coords)
+                else:
+                    logger.debug("No monitor matched incoming global coords (raw or scaled)")
             except Exception:
                 logger.exception("mss mapping failed in native host")
     except Exception:
@@ -217,11 +290,12 @@ def write_log(data):
         logger.exception("Error while attempting to map global coords in native host")
 
     _CLICK_LOGGER.log_click(record)
-    try:
-        # Log to native_host.log for diagnostics (do not write to stdout/stderr)
-        logger.info(f"Wrote click record to NDJSON: { _CLICK_LOGGER.ndjson_path }")
-    except Exception:
-        pass
+    # log_click only queues the record; wait for it to reach disk before the
+    # caller acks, since Chrome may kill the host once the port disconnects
+    _CLICK_LOGGER.flush()
+    # Log to native_host.log for diagnostics (do not write to stdout/stderr)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Wrote click record to NDJSON: %s", _CLICK_LOGGER.ndjson_path)
 
 
 def main():
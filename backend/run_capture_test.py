@@ -25,7 +25,7 @@ if __name__ == "__main__":
     data_root = repo_data()
     print("Using data root:", data_root)
     before = count_pngs_for_today(data_root)
-    cfg = CaptureConfig(hz=1.0, output_base=data_root)
+    cfg = CaptureConfig(hz=1.0, output_base=data_root, output_format="png")
     sc = ScreenCapture(cfg)
     print("Running short capture for 3 seconds...")
     sc.start()
@@ -2,12 +2,12 @@
 Calls native_host.write_log with global_x/global_y and prints NDJSON/CSV tail.
 """
 import os
-import time
 from native_host import write_log
-from logger import ClickLogger
+from logger import get_logger, last_line
 
 OUTPUT_BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
-logger = ClickLogger(OUTPUT_BASE)
+# Same instance native_host writes through, so no second set of open files
+logger = get_logger(OUTPUT_BASE)
 
 payload = {
     "text": "Simulated native ext click",
@@ -20,15 +20,11 @@ payload = {
 print("Calling native_host.write_log with payload:", payload)
 write_log(payload)
 
-# allow file writes
-time.sleep(0.1)
+# wait for the background writer to append the record
+logger.flush()
 ndjson_path = logger.ndjson_path
 csv_path = logger.csv_path
 print('NDJSON:', ndjson_path)
-with open(ndjson_path, 'r', encoding='utf-8') as f:
-    lines = f.readlines()
-    print(lines[-1].strip())
+print(last_line(ndjson_path))
 print('CSV:', csv_path)
-with open(csv_path, 'r', encoding='utf-8') as f:
-    lines = f.readlines()
-    print(lines[-1].strip())
+print(last_line(csv_path))
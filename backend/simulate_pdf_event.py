@@ -2,16 +2,15 @@
 
 This script uses ClickLogger directly to log a synthetic record for today.
 """
-import time
 import os
-from logger import ClickLogger
+from logger import get_logger, last_line, utc_iso_millis
 
 OUTPUT_BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
-logger = ClickLogger(OUTPUT_BASE)
+logger = get_logger(OUTPUT_BASE)
 
 record = {
-    # time.strftime doesn't support %f; use time.time() for ms
-    "timestamp_utc": time.strftime("%Y-%m-%dT%H-%M-%S", time.gmtime()) + ".000Z",
+    # Same format ClickLogger uses, formatted from its per-second cache
+    "timestamp_utc": utc_iso_millis(),
     "x": 100,
     "y": 200,
     "app_name": "chrome",
@@ -26,32 +25,22 @@ record = {
 }
 
 print("Logging synthetic PDF click record...")
-logger.log_click(record)
+logger.log_clicks([record])
 
-# Give a moment for file writes
-time.sleep(0.1)
+# Wait for the background writer to append the record
+logger.flush()
 
 # Print last NDJSON line for today
 ndjson_path = logger.ndjson_path
 csv_path = logger.csv_path
 print("NDJSON:", ndjson_path)
 try:
-    with open(ndjson_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-        if lines:
-            print(lines[-1].strip())
-        else:
-            print('<no lines>')
+    print(last_line(ndjson_path))
 except Exception as e:
     print('Failed to read NDJSON:', e)
 
 print('CSV:', csv_path)
 try:
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-        if lines:
-            print(lines[-1].strip())
-        else:
-            print('<no lines>')
+    print(last_line(csv_path))
 except Exception as e:
     print('Failed to read CSV:', e)
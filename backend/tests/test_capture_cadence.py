@@ -8,13 +8,27 @@ def repo_data():
     return os.path.abspath(os.path.join(here, "..", "data"))
 
 
+def new_png(d, t):
+    """True if ``d`` holds a PNG modified at or after ``t``; stops at the first."""
+    try:
+        with os.scandir(d) as it:
+            return any(e.name[-4:].lower() == '.png' and e.stat().st_mtime >= t for e in it)
+    except FileNotFoundError:
+        # Capture hasn't created today's folder yet
+        return False
+
+
 def test_capture_creates_png(tmp_path):
     data_root = repo_data()
-    before = len([p for p in os.listdir(os.path.join(data_root, time.strftime("%Y-%m-%d"))) if p.lower().endswith('.png')]) if os.path.isdir(os.path.join(data_root, time.strftime("%Y-%m-%d"))) else 0
-    cfg = CaptureConfig(hz=1.0, output_base=data_root)
+    # ScreenCapture writes periodic frames to <base>/<UTC day>/screenshots
+    day_dir = os.path.join(data_root, time.strftime("%Y-%m-%d", time.gmtime()), "screenshots")
+    cfg = CaptureConfig(hz=1.0, output_base=data_root, output_format="png")
     sc = ScreenCapture(cfg)
+    t_start = time.time()
     sc.start()
-    time.sleep(2.2)
+    # Stop as soon as a frame lands instead of sleeping a fixed 2.2 s
+    deadline = time.monotonic() + 3.0
+    while time.monotonic() < deadline and not new_png(day_dir, t_start):
+        time.sleep(0.05)
     sc.stop()
-    after = len([p for p in os.listdir(os.path.join(data_root, time.strftime("%Y-%m-%d"))) if p.lower().endswith('.png')]) if os.path.isdir(os.path.join(data_root, time.strftime("%Y-%m-%d"))) else 0
-    assert after - before >= 1
+    assert new_png(day_dir, t_start)
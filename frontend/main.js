@@ -218,7 +218,8 @@ async function captureScreenshot() {
       }
       let newest = null;
       for (const f of files) {
-        if (!f.toLowerCase().endsWith('.png')) continue;
+        const lower = f.toLowerCase();
+        if (!lower.endsWith('.png') && !lower.endsWith('.jpg')) continue;
         try {
           const st = await fsPromises.stat(path.join(shotsDir, f));
           if (!newest || st.mtimeMs > newest.mtimeMs) {
@@ -231,7 +232,8 @@ async function captureScreenshot() {
       if (newest && now - newest.mtimeMs <= maxAgeMs) {
         try {
           const buf = await fsPromises.readFile(path.join(shotsDir, newest.name));
-          return `data:image/png;base64,${buf.toString('base64')}`;
+          const mime = newest.name.toLowerCase().endsWith('.jpg') ? 'image/jpeg' : 'image/png';
+          return `data:${mime};base64,${buf.toString('base64')}`;
         } catch (e) {
           // fall through to thumbnail
         }